@@ -1,6 +1,5 @@
 from flask import Flask, render_template
 from config import Config
-from services.representative_role_sync_service import sync_user_roles_from_representatives
 
 
 # Blueprints
@@ -36,6 +35,11 @@ def create_app():
         static_folder=os.path.join(BASE_DIR, "static")
     )
 
+    # VoteCast reads start at the contract's deploy block; without it
+    # they would scan the chain from genesis
+    if Config.BLOCKCHAIN_MODE == "WEB3" and not Config.VOTING_CONTRACT_DEPLOY_BLOCK:
+        raise RuntimeError("VOTING_CONTRACT_DEPLOY_BLOCK must be set in WEB3 mode")
+
     app.config["SECRET_KEY"] = Config.SECRET_KEY
     app.config["DEBUG"] = Config.DEBUG
 
@@ -74,9 +78,6 @@ def create_app():
 
 
 
-    @app.before_request
-    def sync_roles_once_per_request():
-        sync_user_roles_from_representatives()
     # -----------------------------
     # Error Handlers
     # -----------------------------
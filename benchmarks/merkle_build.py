@@ -0,0 +1,50 @@
+# benchmarks/merkle_build.py
+#
+# Serial vs process-pool Merkle tree build.
+#
+# Usage (from the repo root):
+#   python -m benchmarks.merkle_build
+#   python -m benchmarks.merkle_build --sizes 100000 1000000 --workers 8
+
+import argparse
+import os
+import time
+
+from utils.merkle import build_merkle_tree
+
+DEFAULT_SIZES = [100_000, 1_000_000, 10_000_000]
+
+
+def _random_receipts(n):
+    return [os.urandom(32).hex() for _ in range(n)]
+
+
+def _time_build(receipts, workers):
+    start = time.perf_counter()
+    tree = build_merkle_tree(receipts, workers=workers)
+    return time.perf_counter() - start, tree[-1][0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel Merkle build")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"workers={args.workers}")
+    print(f"{'leaves':>12} {'serial s':>10} {'parallel s':>11} {'speedup':>8}")
+
+    for n in args.sizes:
+        receipts = _random_receipts(n)
+
+        serial_s, serial_root = _time_build(receipts, workers=1)
+        parallel_s, parallel_root = _time_build(receipts, workers=args.workers)
+
+        if serial_root != parallel_root:
+            raise SystemExit(f"Root mismatch at {n} leaves")
+
+        print(f"{n:>12} {serial_s:>10.2f} {parallel_s:>11.2f} {serial_s / parallel_s:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
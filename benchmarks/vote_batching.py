@@ -0,0 +1,62 @@
+# benchmarks/vote_batching.py
+#
+# castVote per ballot vs castVotes batches, against a local dev chain
+# (anvil / hardhat node) with VotingContract deployed.
+#
+# Usage (from the repo root):
+#   anvil &                      # chain id 31337
+#   export BLOCKCHAIN_MODE=WEB3 CHAIN_ID=31337 \
+#          WEB3_PROVIDER_URL=http://127.0.0.1:8545 \
+#          VOTING_CONTRACT_ADDRESS=0x... BOOTH_PRIVATE_KEY=0x...
+#   python -m benchmarks.vote_batching --votes 200 --batch-size 50
+
+import argparse
+import time
+import uuid
+
+from services.chain_client import get_web3
+from services.blockchain_service import cast_vote_on_chain, cast_votes_on_chain
+
+
+def _wait_for_receipts(tx_hashes):
+    w3 = get_web3()
+    return [w3.eth.wait_for_transaction_receipt(h) for h in tx_hashes]
+
+
+def _run(label, send):
+    start = time.perf_counter()
+    receipts = _wait_for_receipts(send())
+    elapsed = time.perf_counter() - start
+
+    gas = sum(r["gasUsed"] for r in receipts)
+    return label, len(receipts), gas, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="castVote vs castVotes")
+    parser.add_argument("--votes", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    election_id = str(uuid.uuid4())
+    candidate_ids = [str(uuid.uuid4()) for _ in range(4)]
+    ballots = [candidate_ids[i % len(candidate_ids)] for i in range(args.votes)]
+
+    def single():
+        return [cast_vote_on_chain(election_id, c, None) for c in ballots]
+
+    def batched():
+        return [
+            cast_votes_on_chain(election_id, ballots[i:i + args.batch_size])
+            for i in range(0, len(ballots), args.batch_size)
+        ]
+
+    print(f"votes={args.votes} batch_size={args.batch_size}")
+    print(f"{'mode':>10} {'txs':>6} {'gas/vote':>10} {'votes/s':>9}")
+
+    for label, txs, gas, elapsed in (_run("castVote", single), _run("castVotes", batched)):
+        print(f"{label:>10} {txs:>6} {gas / args.votes:>10.0f} {args.votes / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,26 @@ contract VotingContract {
         );
     }
 
+    // --------------------------------------------------
+    // BATCH CAST (ONE TX, ONE EVENT PER VOTE)
+    // --------------------------------------------------
+
+    function castVotes(
+        uint256 electionId,
+        uint256[] calldata candidateIds
+    ) external {
+        uint256 count = candidateIds.length;
+
+        for (uint256 i = 0; i < count; ) {
+            emit VoteCast(
+                electionId,
+                candidateIds[i],
+                block.timestamp
+            );
+            unchecked { ++i; }
+        }
+    }
+
     // --------------------------------------------------
     // POST-ELECTION: PUBLISH ROOT
     // --------------------------------------------------
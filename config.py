@@ -64,3 +64,108 @@ class Config:
     WEB3_PROVIDER_URL = os.getenv("WEB3_PROVIDER_URL")
     VOTING_CONTRACT_ADDRESS = os.getenv("VOTING_CONTRACT_ADDRESS")
     BOOTH_PRIVATE_KEY = os.getenv("BOOTH_PRIVATE_KEY")
+    # Sepolia by default; a local dev chain (anvil / hardhat) uses its own
+    CHAIN_ID = int(os.getenv("CHAIN_ID", 11155111))
+    VOTING_CONTRACT_ABI_PATH = os.getenv(
+        "VOTING_CONTRACT_ABI_PATH", "blockchain/abi/VotingContractABI.json"
+    )
+
+    # Shared RPC client: pooled HTTP connections, request timeout (s)
+    WEB3_HTTP_POOL_SIZE = int(os.getenv("WEB3_HTTP_POOL_SIZE", 20))
+    WEB3_HTTP_TIMEOUT = int(os.getenv("WEB3_HTTP_TIMEOUT", 30))
+
+    # Booth signer: shared nonce state (one file per address, locked
+    # across workers), resends on nonce errors, gas price reuse (s)
+    NONCE_STATE_DIR = os.getenv("NONCE_STATE_DIR", "data/nonces")
+    NONCE_RETRIES = int(os.getenv("NONCE_RETRIES", 2))
+    GAS_PRICE_TTL = int(os.getenv("GAS_PRICE_TTL", 10))
+    # Pending count re-read interval, and how long it may sit below the
+    # local counter before the missing nonce is presumed lost
+    NONCE_CHECK_SECONDS = int(os.getenv("NONCE_CHECK_SECONDS", 15))
+    NONCE_GAP_SECONDS = int(os.getenv("NONCE_GAP_SECONDS", 120))
+
+    # Vote submission: SYNC (castVote inside the request) or OUTBOX
+    # (queued locally, sent by jobs/vote_outbox_job, which must be running)
+    VOTE_SUBMISSION_MODE = os.getenv("VOTE_SUBMISSION_MODE", "SYNC")
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+    OUTBOX_SEND_WORKERS = int(os.getenv("OUTBOX_SEND_WORKERS", 4))
+    OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", 2))
+    OUTBOX_MAX_BACKOFF = int(os.getenv("OUTBOX_MAX_BACKOFF", 300))
+    # Sends after which a batch that still reverts is marked FAILED
+    OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 5))
+    # castVotes batching: a batch is sent once it holds VOTE_BATCH_SIZE
+    # votes or its oldest vote has waited VOTE_BATCH_MAX_WAIT_MS
+    VOTE_BATCH_SIZE = int(os.getenv("VOTE_BATCH_SIZE", 50))
+    VOTE_BATCH_MAX_WAIT_MS = int(os.getenv("VOTE_BATCH_MAX_WAIT_MS", 2000))
+    # Confirmation tracker: receipts per JSON-RPC batch, pending
+    # transactions checked per run, seconds between runs
+    TX_RECEIPT_BATCH_SIZE = int(os.getenv("TX_RECEIPT_BATCH_SIZE", 100))
+    TX_CONFIRM_SCAN_LIMIT = int(os.getenv("TX_CONFIRM_SCAN_LIMIT", 1000))
+    TX_CONFIRM_POLL_SECONDS = int(os.getenv("TX_CONFIRM_POLL_SECONDS", 10))
+    # Seconds before a SENDING claim is presumed crashed, and before an
+    # unmined tx the node no longer knows is resubmitted
+    OUTBOX_STALE_SECONDS = int(os.getenv("OUTBOX_STALE_SECONDS", 120))
+
+    # VoteCast indexer: scan start (required in WEB3 mode), blocks per
+    # step, reorg safety margin
+    VOTING_CONTRACT_DEPLOY_BLOCK = int(os.getenv("VOTING_CONTRACT_DEPLOY_BLOCK", 0))
+    CHAIN_INDEX_BLOCK_RANGE = int(os.getenv("CHAIN_INDEX_BLOCK_RANGE", 2000))
+    CHAIN_INDEX_CONFIRMATIONS = int(os.getenv("CHAIN_INDEX_CONFIRMATIONS", 12))
+    CHAIN_INDEX_POLL_SECONDS = int(os.getenv("CHAIN_INDEX_POLL_SECONDS", 15))
+
+    # eth_getLogs chunking: starting/max blocks per call, logs per call
+    # before shrinking, concurrent calls, retries of a single block
+    CHAIN_LOG_CHUNK_BLOCKS = int(os.getenv("CHAIN_LOG_CHUNK_BLOCKS", 2000))
+    CHAIN_LOG_MAX_CHUNK_BLOCKS = int(os.getenv("CHAIN_LOG_MAX_CHUNK_BLOCKS", 50000))
+    CHAIN_LOG_TARGET_LOGS = int(os.getenv("CHAIN_LOG_TARGET_LOGS", 5000))
+    CHAIN_LOG_WORKERS = int(os.getenv("CHAIN_LOG_WORKERS", 4))
+    CHAIN_LOG_RETRIES = int(os.getenv("CHAIN_LOG_RETRIES", 3))
+
+    # Seconds an election-wide vote tally is shared between result requests
+    RESULTS_CACHE_TTL = int(os.getenv("RESULTS_CACHE_TTL", 30))
+
+    # Seconds a published Merkle root is trusted before re-reading the chain
+    MERKLE_ROOT_CACHE_TTL = int(os.getenv("MERKLE_ROOT_CACHE_TTL", 300))
+
+    # -----------------------
+    # Merkle Finalization
+    # -----------------------
+    MERKLE_PROOF_CHUNK_SIZE = int(os.getenv("MERKLE_PROOF_CHUNK_SIZE", 1000))
+    MERKLE_PROOF_WRITE_WORKERS = int(os.getenv("MERKLE_PROOF_WRITE_WORKERS", 4))
+    MERKLE_PROOF_WRITE_RETRIES = int(os.getenv("MERKLE_PROOF_WRITE_RETRIES", 3))
+
+    # DB   → one vote_merkle_proofs row per receipt
+    # FILE → memory-mapped tree files under MERKLE_TREE_DIR; local to
+    #        each host and rebuilt from vote_receipts when missing
+    MERKLE_PROOF_STORAGE = os.getenv("MERKLE_PROOF_STORAGE", "DB")
+    MERKLE_TREE_DIR = os.getenv("MERKLE_TREE_DIR", "data/merkle_trees")
+
+    # Worker processes for hashing tree levels (1 = serial)
+    MERKLE_BUILD_WORKERS = int(os.getenv("MERKLE_BUILD_WORKERS", 1))
+
+    # Constituency subtrees finalized concurrently
+    MERKLE_SHARD_WORKERS = int(os.getenv("MERKLE_SHARD_WORKERS", 4))
+
+    # Rows per keyset page when streaming receipts
+    RECEIPT_PAGE_SIZE = int(os.getenv("RECEIPT_PAGE_SIZE", 1000))
+
+    # -----------------------
+    # Booth Sessions
+    # -----------------------
+    # MEMORY → per-process dicts (single worker only)
+    # SQLITE → WAL database file shared by all workers on the host
+    BOOTH_SESSION_STORE = os.getenv("BOOTH_SESSION_STORE", "MEMORY")
+    BOOTH_SESSION_DB = os.getenv("BOOTH_SESSION_DB", "data/booth_sessions.sqlite3")
+
+    # Seconds an authorized voter session stays open
+    BOOTH_SESSION_TTL = int(os.getenv("BOOTH_SESSION_TTL", 900))
+
+    # Booth status stream (SSE). Each open stream holds a worker, so it
+    # is off by default (terminals poll /evote/booth-status); turn it
+    # on only behind gunicorn threaded/async workers (gthread, gevent).
+    # Seconds per connection before the terminal reconnects, between
+    # keepalives, between store checks
+    BOOTH_STATUS_SSE = os.getenv("BOOTH_STATUS_SSE", "false").lower() == "true"
+    BOOTH_STATUS_STREAM_SECONDS = int(os.getenv("BOOTH_STATUS_STREAM_SECONDS", 300))
+    BOOTH_STATUS_HEARTBEAT_SECONDS = int(os.getenv("BOOTH_STATUS_HEARTBEAT_SECONDS", 15))
+    BOOTH_STATUS_CHECK_SECONDS = float(os.getenv("BOOTH_STATUS_CHECK_SECONDS", 1))
@@ -0,0 +1,14 @@
+import time
+from config import Config
+from services.chain_index_service import sync_vote_index
+
+
+def run_chain_index_job():
+    return sync_vote_index()
+
+
+if __name__ == "__main__":
+    # Long-running tail: python -m jobs.chain_index_job
+    while True:
+        run_chain_index_job()
+        time.sleep(Config.CHAIN_INDEX_POLL_SECONDS)
@@ -0,0 +1,10 @@
+from services.representative_role_sync_service import sync_user_roles_from_representatives
+
+
+def run_role_sync_job():
+    return sync_user_roles_from_representatives()
+
+
+if __name__ == "__main__":
+    # Daily (and after deploys): python -m jobs.role_sync_job
+    print("[role sync]", run_role_sync_job())
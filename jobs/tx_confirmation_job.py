@@ -0,0 +1,15 @@
+import time
+from config import Config
+from services.tx_confirmation_service import track_confirmations, get_confirmation_backlog
+
+
+def run_tx_confirmation_job():
+    return track_confirmations()
+
+
+if __name__ == "__main__":
+    # Long-running tracker: python -m jobs.tx_confirmation_job
+    while True:
+        updated = run_tx_confirmation_job()
+        print("[confirmations]", updated, get_confirmation_backlog())
+        time.sleep(Config.TX_CONFIRM_POLL_SECONDS)
@@ -0,0 +1,18 @@
+import time
+from config import Config
+from services.vote_outbox_service import run_vote_outbox_once
+
+
+def run_vote_outbox_job():
+    return run_vote_outbox_once()
+
+
+if __name__ == "__main__":
+    # Long-running dispatcher: python -m jobs.vote_outbox_job
+    while True:
+        run_vote_outbox_job()
+        # Poll at least as often as a partial batch may wait
+        time.sleep(min(
+            Config.OUTBOX_POLL_SECONDS,
+            Config.VOTE_BATCH_MAX_WAIT_MS / 1000
+        ))
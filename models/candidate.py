@@ -1,5 +1,6 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, fetch_many, insert_record, update_record
 from utils.helpers import generate_uuid, utc_now, format_datetime
+from utils.crypto import register_candidate_id, candidate_id_to_uint
 
 
 # -----------------------------
@@ -20,12 +21,16 @@ def create_candidate(
     constituency_id: str,
     party_name: str
 ):
+    candidate_id = generate_uuid()
+
     payload = {
-        "id": generate_uuid(),
+        "id": candidate_id,
         "user_id": user_id,
         "election_id": election_id,
         "constituency_id": constituency_id,
         "party_name": party_name,
+        # uint256 id used on chain, stored as decimal text
+        "chain_id": str(register_candidate_id(candidate_id)),
         "status": "Pending",
         "created_at": utc_now().isoformat()
     }
@@ -40,6 +45,16 @@ def get_candidates_by_election(election_id: str):
     return fetch_all(CANDIDATES_TABLE, {"election_id": election_id})
 
 
+def load_candidate_chain_ids(election_id: str):
+    """
+    Registers every candidate of an election with the candidate ID
+    codec (utils.crypto), so chain ids resolve with a dict lookup.
+    Rows nominated before chain_id was stored are hashed once.
+    """
+    for c in get_candidates_by_election(election_id):
+        register_candidate_id(c["id"], c.get("chain_id"))
+
+
 def get_candidates_by_constituency(constituency_id):
     """
     Returns candidates with resolved display name
@@ -97,27 +112,34 @@ def get_candidates_by_election_and_constituency(election_id, constituency_id):
         }
     )
 
+    # user_id → voter_id, then voter_id → full_name: two IN queries
+    voter_maps = fetch_many(
+        "voter_user_map",
+        "user_id",
+        [c["user_id"] for c in candidates],
+        columns=["voter_id"]
+    )
+    voters = fetch_many(
+        "voters",
+        "id",
+        [m["voter_id"] for m in voter_maps.values()],
+        columns=["full_name"]
+    )
+
     result = []
 
     for c in candidates:
-        # user_id → voter_id
-        voter_map = fetch_one(
-            "voter_user_map",
-            {"user_id": c["user_id"]}
-        )
+        voter_map = voter_maps.get(c["user_id"])
         if not voter_map:
             continue
 
-        # voter_id → full_name
-        voter = fetch_one(
-            "voters",
-            {"id": voter_map["voter_id"]}
-        )
+        voter = voters.get(voter_map["voter_id"])
         if not voter:
             continue
 
         result.append({
             "id": c["id"],
+            "user_id": c["user_id"],
             "candidate_name": voter["full_name"],
             "party_name": c["party_name"]
         })
@@ -201,13 +223,11 @@ def get_candidates_with_names(election_id: str, constituency_id: str):
     return enriched
 
 def map_candidate_uint_to_name(constituency_id):
-    from utils.crypto import uuid_to_uint256
-
     candidates = get_candidates_by_constituency(constituency_id)
 
     mapping = {}
     for c in candidates:
-        mapping[uuid_to_uint256(c["id"])] = c["candidate_name"]
+        mapping[candidate_id_to_uint(c["id"])] = c["candidate_name"]
 
     return mapping
 
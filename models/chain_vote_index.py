@@ -0,0 +1,67 @@
+# models/chain_vote_index.py
+
+from supabase_db.db import fetch_one, fetch_all, upsert_record
+from utils.helpers import utc_now
+
+TALLY_TABLE = "chain_vote_tallies"
+CHECKPOINT_TABLE = "chain_index_checkpoints"
+
+
+# -----------------------------
+# Checkpoints
+# -----------------------------
+
+def get_index_checkpoint(stream: str):
+    """
+    Last block fully indexed for an event stream, or None.
+    """
+    record = fetch_one(
+        CHECKPOINT_TABLE,
+        {"stream": stream},
+        use_admin=True
+    )
+    return record["last_block"] if record else None
+
+
+def save_index_checkpoint(stream: str, last_block: int):
+    return upsert_record(
+        CHECKPOINT_TABLE,
+        {
+            "stream": stream,
+            "last_block": last_block,
+            "updated_at": utc_now().isoformat()
+        },
+        conflict_columns=["stream"],
+        use_admin=True
+    )
+
+
+# -----------------------------
+# Vote Tallies
+# -----------------------------
+# uint256 ids don't fit in bigint → stored as decimal strings
+
+def get_vote_tallies(election_uint):
+    """
+    Rows of (candidate_uint, votes, last_block) for one election.
+    """
+    return fetch_all(
+        TALLY_TABLE,
+        {"election_uint": str(election_uint)},
+        use_admin=True
+    )
+
+
+def save_vote_tallies(rows: list):
+    """
+    Bulk upsert of tally rows keyed by (election_uint, candidate_uint).
+    """
+    if not rows:
+        return None
+
+    return upsert_record(
+        TALLY_TABLE,
+        rows,
+        conflict_columns=["election_uint", "candidate_uint"],
+        use_admin=True
+    )
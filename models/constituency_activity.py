@@ -1,6 +1,6 @@
-from supabase_db.db import fetch_all,fetch_one
+from supabase_db.db import fetch_all,fetch_one,count_many
 from utils.helpers import utc_now
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 # -----------------------------
@@ -32,29 +32,27 @@ def _today_iso_prefix():
     return utc_now().date().isoformat()
 
 
+def _created_today(column: str = "created_at"):
+    # [today, tomorrow) as conditions, so Postgres drops older rows
+    today = utc_now().date()
+    return [
+        (column, "gte", today.isoformat()),
+        (column, "lt", (today + timedelta(days=1)).isoformat())
+    ]
+
+
 # -----------------------------
 # Issues Created Today
 # -----------------------------
 
 def get_issues_created_today(constituency_id: str):
-    issues = fetch_all(
+    return fetch_all(
         ISSUES_TABLE,
-        {"constituency_id": constituency_id}
+        {"constituency_id": constituency_id},
+        columns=["id", "title", "category", "created_at"],
+        conditions=_created_today()
     ) or []
 
-    today = _today_iso_prefix()
-
-    return [
-        {
-            "id": i["id"],
-            "title": i["title"],
-            "category": i["category"],
-            "created_at": i["created_at"]
-        }
-        for i in issues
-        if i.get("created_at", "").startswith(today)
-    ]
-
 
 # -----------------------------
 # Issues Getting Attention Today
@@ -63,28 +61,28 @@ def get_issues_created_today(constituency_id: str):
 def get_active_issue_discussions_today(constituency_id: str):
     issues = fetch_all(
         ISSUES_TABLE,
-        {"constituency_id": constituency_id}
+        {"constituency_id": constituency_id},
+        columns=["id", "title"]
     ) or []
 
-    today = _today_iso_prefix()
+    # Today's comments per issue, counted from one IN query of ids
+    comments_today = count_many(
+        ISSUE_COMMENTS_TABLE,
+        "issue_id",
+        [i["id"] for i in issues],
+        conditions=_created_today()
+    )
+
     results = []
 
     for issue in issues:
-        comments = fetch_all(
-            ISSUE_COMMENTS_TABLE,
-            {"issue_id": issue["id"]}
-        ) or []
-
-        today_comments = [
-            c for c in comments
-            if c.get("created_at", "").startswith(today)
-        ]
+        today_count = comments_today.get(issue["id"], 0)
 
-        if len(today_comments) >= 3:   # threshold for activity
+        if today_count >= 3:   # threshold for activity
             results.append({
                 "issue_id": issue["id"],
                 "title": issue["title"],
-                "comment_count_today": len(today_comments)
+                "comment_count_today": today_count
             })
 
     return results
@@ -126,11 +124,11 @@ def get_issues_resolved_today(constituency_id: str):
 def get_policy_posts_today(constituency_id: str):
     posts = fetch_all(
         POLICY_POSTS_TABLE,
-        {"constituency_id": constituency_id}
+        {"constituency_id": constituency_id},
+        columns=["id", "title", "created_by_role", "rep_name", "opp_name"],
+        conditions=_created_today()
     ) or []
 
-    today = _today_iso_prefix()
-
     return [
         {
             "id": p["id"],
@@ -139,7 +137,6 @@ def get_policy_posts_today(constituency_id: str):
             "author_name": p.get("rep_name") or p.get("opp_name")
         }
         for p in posts
-        if p.get("created_at", "").startswith(today)
     ]
 
 
@@ -150,28 +147,27 @@ def get_policy_posts_today(constituency_id: str):
 def get_active_policy_debates_today(constituency_id: str):
     posts = fetch_all(
         POLICY_POSTS_TABLE,
-        {"constituency_id": constituency_id}
+        {"constituency_id": constituency_id},
+        columns=["id", "title"]
     ) or []
 
-    today = _today_iso_prefix()
+    comments_today = count_many(
+        POLICY_COMMENTS_TABLE,
+        "post_id",
+        [p["id"] for p in posts],
+        conditions=_created_today()
+    )
+
     debates = []
 
     for p in posts:
-        comments = fetch_all(
-            POLICY_COMMENTS_TABLE,
-            {"post_id": p["id"]}
-        ) or []
-
-        today_comments = [
-            c for c in comments
-            if c.get("created_at", "").startswith(today)
-        ]
+        today_count = comments_today.get(p["id"], 0)
 
-        if len(today_comments) >= 3:
+        if today_count >= 3:
             debates.append({
                 "post_id": p["id"],
                 "title": p.get("title"),
-                "comment_count_today": len(today_comments)
+                "comment_count_today": today_count
             })
 
     return debates
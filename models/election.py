@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, fetch_many, insert_record, update_record
 from utils.helpers import generate_uuid, utc_now, format_datetime
 from datetime import datetime
 
@@ -46,6 +46,14 @@ def create_election(
 def get_state_name_by_state_id(state_id):
     return fetch_one("states", {"id": state_id})
 
+def get_election_status(election_id: str):
+    """
+    Status of an election, or None if it doesn't exist.
+    """
+    election = fetch_one(ELECTIONS_TABLE, {"id": election_id}, columns=["status"])
+    return election["status"] if election else None
+
+
 def get_election_by_id(election_id: str):
     election=fetch_one(ELECTIONS_TABLE, {"id": election_id})
     state=get_state_name_by_state_id(election['state_id'])
@@ -107,13 +115,18 @@ def get_constituencies_for_election(election_id):
         {"election_id": election_id}
     )
 
+    # One IN query for every mapped constituency
+    constituencies = fetch_many(
+        "constituencies",
+        "id",
+        [m["constituency_id"] for m in mappings],
+        columns=["constituency_name"]
+    )
+
     results = []
 
     for m in mappings:
-        constituency = fetch_one(
-            "constituencies",
-            {"id": m["constituency_id"]}
-        )
+        constituency = constituencies.get(m["constituency_id"])
 
         if not constituency:
             continue
@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, fetch_many, count_records, load_one, insert_record, update_record
 from utils.helpers import generate_uuid, utc_now
 
 
@@ -39,13 +39,25 @@ def create_issue(
 
 
 def get_issue_by_id(issue_id: str):
-    return fetch_one(ISSUES_TABLE, {"id": issue_id})
+    return load_one(ISSUES_TABLE, {"id": issue_id})
 
 
 def get_issues_by_constituency(constituency_id: str):
     return fetch_all(ISSUES_TABLE, {"constituency_id": constituency_id})
 
 
+def count_issues_by_status(constituency_id: str, statuses: list) -> int:
+    """
+    Number of a constituency's issues in any of `statuses`,
+    counted by Postgres (no issue rows are transferred).
+    """
+    return count_records(
+        ISSUES_TABLE,
+        {"constituency_id": constituency_id},
+        conditions=[("status", "in", statuses)]
+    )
+
+
 def update_issue_status(issue_id: str, status: str):
     return update_record(
         ISSUES_TABLE,
@@ -327,8 +339,11 @@ def get_issue_comments_by_constituency(constituency_id):
     # -----------------------------------
     # Get all comments for those issues
     # -----------------------------------
+    comments_by_issue = fetch_many(
+        "issue_comments", "issue_id", issue_ids, group=True
+    )
+
     comments = []
     for issue_id in issue_ids:
-        issue_comments = fetch_all("issue_comments", {"issue_id": issue_id}) or []
-        comments.extend(issue_comments)
+        comments.extend(comments_by_issue.get(issue_id, []))
     return comments
\ No newline at end of file
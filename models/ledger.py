@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record
+from supabase_db.db import fetch_one, fetch_all, insert_record, iter_all, update_many, count_records
 from utils.helpers import generate_uuid, utc_now
 
 
@@ -17,16 +17,26 @@ def create_ledger_entry(
     entity_type: str,
     entity_id: str,
     transaction_hash: str,
-    block_number: int = None
+    block_number: int = None,
+    status: str = None,
+    timestamp: str = None
 ):
+    """
+    status: "PENDING" for on-chain transactions still to be confirmed
+    by the confirmation tracker; None for off-chain hashes.
+    timestamp: ISO time to record instead of now.
+    """
     payload = {
         "id": generate_uuid(),
         "entity_type": entity_type,
         "entity_id": entity_id,
         "transaction_hash": transaction_hash,
         "block_number": block_number,
-        "timestamp": utc_now().isoformat()
+        "timestamp": timestamp or utc_now().isoformat()
     }
+    if status:
+        payload["status"] = status
+
     return insert_record(LEDGER_TABLE, payload, use_admin=True)
 
 
@@ -47,6 +57,44 @@ def get_ledger_entries_by_entity(entity_type: str, entity_id: str):
 def get_all_ledger_entries():
     return fetch_all(LEDGER_TABLE)
 
+
+# -----------------------------
+# Confirmation Tracking
+# -----------------------------
+
+def iter_ledger_entries_by_status(status: str, page_size: int = 1000):
+    """
+    Streams entries in one status, oldest first.
+    """
+    return iter_all(
+        LEDGER_TABLE,
+        {"status": status},
+        key_columns=["timestamp", "id"],
+        page_size=page_size,
+        use_admin=True
+    )
+
+
+def update_ledger_status(transaction_hashes: list, status: str, block_number: int = None):
+    """
+    Bulk update of every entry for the given transactions.
+    """
+    payload = {"status": status}
+    if block_number is not None:
+        payload["block_number"] = block_number
+
+    return update_many(
+        LEDGER_TABLE,
+        "transaction_hash",
+        transaction_hashes,
+        payload,
+        use_admin=True
+    )
+
+
+def count_ledger_entries_by_status(status: str) -> int:
+    return count_records(LEDGER_TABLE, {"status": status}, use_admin=True)
+
 def get_vote_by_transaction_hash(tx_hash):
     return fetch_one("votes", {"transaction_id": tx_hash})
 
@@ -0,0 +1,70 @@
+# models/merkle_accumulator.py
+
+from supabase_db.db import fetch_one, fetch_all, insert_records, update_record
+from utils.helpers import utc_now
+
+TABLE = "merkle_accumulators"
+
+
+def get_accumulator(election_id, constituency_id):
+    return fetch_one(
+        TABLE,
+        {
+            "election_id": election_id,
+            "constituency_id": constituency_id
+        },
+        use_admin=True
+    )
+
+
+def get_accumulators_by_election(election_id):
+    """
+    One accumulator per constituency that has received votes.
+    """
+    return fetch_all(
+        TABLE,
+        {"election_id": election_id},
+        use_admin=True
+    )
+
+
+def create_accumulator(election_id, constituency_id):
+    """
+    Creates an empty accumulator. Safe if one already exists.
+    """
+    return insert_records(
+        TABLE,
+        [{
+            "election_id": election_id,
+            "constituency_id": constituency_id,
+            "leaf_count": 0,
+            "frontier": [],
+            "updated_at": utc_now().isoformat()
+        }],
+        use_admin=True,
+        ignore_conflicts_on=["election_id", "constituency_id"]
+    )
+
+
+def advance_accumulator(election_id, constituency_id, leaf_count, frontier):
+    """
+    Compare-and-set: moves the accumulator from leaf_count to
+    leaf_count + 1 leaves.
+
+    Returns False if another worker already advanced it.
+    """
+    rows = update_record(
+        TABLE,
+        {
+            "election_id": election_id,
+            "constituency_id": constituency_id,
+            "leaf_count": leaf_count
+        },
+        {
+            "leaf_count": leaf_count + 1,
+            "frontier": frontier,
+            "updated_at": utc_now().isoformat()
+        },
+        use_admin=True
+    )
+    return bool(rows)
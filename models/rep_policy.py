@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, load_one, insert_record, update_record
 from utils.helpers import generate_uuid, utc_now,format_datetime
 from models.voter import get_voter_by_user_id
 from supabase_db.db import delete_record
@@ -55,13 +55,13 @@ def create_policy_post(
 
 
 def get_policy_post_by_id(post_id: str, user_id: str = None):
-    post = fetch_one(REP_POLICY_POSTS_TABLE, {"id": post_id})
+    post = load_one(REP_POLICY_POSTS_TABLE, {"id": post_id})
     if not post:
         return None
     # Fetch user info
     user = get_voter_by_user_id(post["created_by_user_id"])
     # Fetch representative info
-    rep = fetch_one("representatives", {"user_id": post["created_by_user_id"]})
+    rep = load_one("representatives", {"user_id": post["created_by_user_id"]})
     post["author_name"] = user.get("full_name") if user else "Unknown"
     post["party_name"] = rep.get("party_name") if rep else "Independent"
     post["created_at"]=format_datetime(post["created_at"])
@@ -73,19 +73,24 @@ def get_policy_post_by_id(post_id: str, user_id: str = None):
 
 
 
-def get_policy_posts_by_constituency(constituency_id: str):
-    posts = fetch_all(
+def get_policy_posts_by_constituency(
+    constituency_id: str,
+    created_by_user_id: str = None
+):
+    """
+    Policy posts of a constituency, newest first (sorted by Postgres).
+    Optionally only one author's.
+    """
+    filters = {"constituency_id": constituency_id}
+    if created_by_user_id:
+        filters["created_by_user_id"] = created_by_user_id
+
+    return fetch_all(
         REP_POLICY_POSTS_TABLE,
-        {"constituency_id": constituency_id}
+        filters,
+        order_by=["-created_at"]
     ) or []
 
-    # sort in Python (newest first)
-    return sorted(
-        posts,
-        key=lambda p: p.get("created_at"),
-        reverse=True
-    )
-
 
 
 def update_representative_statement(post_id: str, content: str):
@@ -188,17 +193,11 @@ def get_user_vote(post_id: str, user_id: str):
 def get_policy_posts_by_user(user_id: str):
     """
     Fetch all policy posts created by a specific user.
-    Sorted newest first.
+    Sorted newest first (by Postgres).
     """
 
-    posts = fetch_all(
+    return fetch_all(
         REP_POLICY_POSTS_TABLE,
-        {"created_by_user_id": user_id}
+        {"created_by_user_id": user_id},
+        order_by=["-created_at"]
     ) or []
-
-    # Sort in Python (newest first)
-    return sorted(
-        posts,
-        key=lambda p: p.get("created_at"),
-        reverse=True
-    )
@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record
+from supabase_db.db import fetch_one, fetch_all, count_many, load_one, queue_load, insert_record
 from utils.helpers import generate_uuid, utc_now, format_datetime, _time_ago
 from datetime import datetime, timezone
 from flask import session
@@ -21,6 +21,19 @@ def add_policy_comment(post_id, user_id, content, parent_comment_id=None):
 
     return insert_record(TABLE, payload, use_admin=True)
 
+def count_policy_comments(post_ids, roots_only=False):
+    """
+    {post_id: number of comments} for many posts (one grouped query).
+
+    roots_only
+        → Top-level comments only (replies not counted).
+    """
+    conditions = [("parent_comment_id", "is", "null")] if roots_only else None
+    counts = count_many(TABLE, "post_id", post_ids, conditions=conditions)
+
+    return {post_id: counts.get(post_id, 0) for post_id in post_ids}
+
+
 def get_policy_comments(post_id):
     comments = fetch_all(
         "rep_policy_comments",
@@ -32,6 +45,9 @@ def get_policy_comments(post_id):
     rep=get_rep_by_election_id_constituency_id(post["election_id"],post["constituency_id"])
     user_id = session.get("user_id")
 
+    # The first alias lookup fetches every commenter's alias (one IN query)
+    queue_load("citizen_alias", "user_id", [c["user_id"] for c in comments])
+
     # attach username + time + vote info
     for c in comments:
         c["is_op"] = c["user_id"] == post["created_by_user_id"]  # ⭐ OP FLAG
@@ -48,7 +64,7 @@ def get_policy_comments(post_id):
         if c.get("ai_generated"):
             c["username"] = "AI Bot"
         else:
-            alias = fetch_one("citizen_alias", {"user_id": c["user_id"]})
+            alias = load_one("citizen_alias", {"user_id": c["user_id"]})
             if c["is_official"]:
                 for r in rep:
                     if c["role"] == r["type"]:
@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, iter_all, insert_record, update_record
 from utils.helpers import generate_uuid, utc_now
 from datetime import date
 
@@ -149,6 +149,21 @@ def get_all_representatives():
     return fetch_all(REPRESENTATIVES_TABLE)
 
 
+def iter_representative_terms():
+    """
+    Streams only the columns role sync needs, page by page.
+    """
+    return iter_all(
+        REPRESENTATIVES_TABLE,
+        columns=["user_id", "type", "term_start", "term_end", "status"],
+        use_admin=True
+    )
+
+
+def get_representatives_by_user(user_id: str):
+    return fetch_all(REPRESENTATIVES_TABLE, {"user_id": user_id})
+
+
 def get_rep_by_election_id_constituency_id(election_id: str, constituency_id: str):
     return fetch_all(
         REPRESENTATIVES_TABLE,
@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, fetch_many, load_one, load_many, queue_load, insert_record, update_record, update_many
 from utils.helpers import generate_uuid, utc_now
 from utils.helpers import normalize_role
 from models.voter import get_voter_user_mapping_by_user
@@ -48,7 +48,7 @@ def create_user(
 
 
 def get_user_by_id(user_id: str):
-    return fetch_one(USERS_TABLE, {"id": user_id})
+    return load_one(USERS_TABLE, {"id": user_id})
 
 
 def get_user_by_email(email: str):
@@ -83,7 +83,7 @@ def create_citizen_alias(user_id: str, random_username: str):
 
 
 def get_citizen_alias(user_id: str):
-    return fetch_one(CITIZEN_ALIAS_TABLE, {"user_id": user_id})
+    return load_one(CITIZEN_ALIAS_TABLE, {"user_id": user_id})
 
 
 def get_alias_by_username(random_username: str):
@@ -97,6 +97,42 @@ def update_user_role(user_id: str, role: str):
         use_admin=True
     )
 
+
+def get_user_roles(user_ids) -> dict:
+    """
+    {user_id: role}, fetching only id and role.
+    """
+    users = fetch_many(USERS_TABLE, "id", user_ids, columns=["role"], use_admin=True)
+    return {user_id: u.get("role") for user_id, u in users.items()}
+
+
+def set_user_roles(user_ids: list, role: str) -> int:
+    """
+    Sets one role on many users (IN-list UPDATE).
+    Returns number of rows updated.
+    """
+    return len(update_many(USERS_TABLE, "id", user_ids, {"role": role}, use_admin=True))
+
+def preload_user_profiles(user_ids):
+    """
+    Loads users and representatives' voter maps for many users in a
+    few IN queries, and queues their aliases and voter rows, so the
+    per-user lookups of this request (get_user_by_id,
+    get_display_name_by_user_id, ...) are served from the loader
+    cache.
+    """
+    users = load_many(USERS_TABLE, "id", user_ids)
+    queue_load(CITIZEN_ALIAS_TABLE, "user_id", user_ids)
+
+    rep_ids = [
+        user_id for user_id, u in users.items()
+        if u and u["role"] in ["ELECTED_REP", "OPPOSITION_REP"]
+    ]
+    if rep_ids:
+        voter_maps = load_many("voter_user_map", "user_id", rep_ids)
+        queue_load("voters", "id", [m["voter_id"] for m in voter_maps.values() if m])
+
+
 def get_display_name_by_user_id(user_id: str) -> str:
     """
     Returns display name based on role:
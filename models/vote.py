@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record, upsert_record
+from supabase_db.db import fetch_one, fetch_all, insert_record, update_record, upsert_record, update_many
 from utils.helpers import generate_uuid, utc_now
 
 
@@ -36,6 +36,19 @@ def cast_vote(
     return insert_record(VOTES_TABLE, payload, use_admin=True)
 
 
+def set_vote_block_numbers(transaction_ids: list, block_number: int):
+    """
+    Backfills block_number on votes mined in the same block.
+    """
+    return update_many(
+        VOTES_TABLE,
+        "transaction_id",
+        transaction_ids,
+        {"block_number": block_number},
+        use_admin=True
+    )
+
+
 def get_vote_by_hash(vote_hash: str):
     return fetch_one(VOTES_TABLE, {"vote_hash": vote_hash})
 
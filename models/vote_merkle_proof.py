@@ -1,21 +1,31 @@
 # models/vote_merkle_proof.py
 
-from supabase_db.db import insert_record, fetch_one
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from config import Config
+from supabase_db.db import insert_record, insert_records, fetch_one, fetch_many, upsert_record
 from utils.helpers import generate_uuid, utc_now
 
 TABLE = "vote_merkle_proofs"
+CHECKPOINT_TABLE = "vote_merkle_proof_checkpoints"
+
+
+def _proof_row(election_id, receipt_hash, proof):
+    return {
+        "id": generate_uuid(),
+        "election_id": election_id,
+        "receipt_hash": receipt_hash,
+        "proof": proof,
+        "created_at": utc_now().isoformat()
+    }
 
 
 def store_merkle_proof(election_id, receipt_hash, proof):
     return insert_record(
         TABLE,
-        {
-            "id": generate_uuid(),
-            "election_id": election_id,
-            "receipt_hash": receipt_hash,
-            "proof": proof,
-            "created_at": utc_now().isoformat()
-        },
+        _proof_row(election_id, receipt_hash, proof),
         use_admin=True
     )
 
@@ -28,3 +38,137 @@ def get_merkle_proof(election_id, receipt_hash):
             "receipt_hash": receipt_hash
         }
     )
+
+
+def get_merkle_proofs(election_id, receipt_hashes):
+    """
+    Returns {receipt_hash: proof} for the receipts that have one.
+    """
+    records = fetch_many(
+        TABLE,
+        "receipt_hash",
+        receipt_hashes,
+        filters={"election_id": election_id},
+        columns=["proof"]
+    )
+    return {h: r["proof"] for h, r in records.items()}
+
+
+# -----------------------------
+# Bulk Proof Persistence
+# -----------------------------
+
+def get_committed_proof_count(election_id):
+    """
+    Number of proofs (in receipt order) already durably written.
+    """
+    record = fetch_one(
+        CHECKPOINT_TABLE,
+        {"election_id": election_id},
+        use_admin=True
+    )
+    return record["committed_rows"] if record else 0
+
+
+def _save_committed_proof_count(election_id, committed_rows):
+    upsert_record(
+        CHECKPOINT_TABLE,
+        {
+            "election_id": election_id,
+            "committed_rows": committed_rows,
+            "updated_at": utc_now().isoformat()
+        },
+        conflict_columns=["election_id"],
+        use_admin=True
+    )
+
+
+def _chunked(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _write_chunk(rows, max_retries):
+    attempt = 0
+    while True:
+        try:
+            # Re-sent chunks (retry / resume overlap) are ignored on conflict
+            return insert_records(
+                TABLE,
+                rows,
+                use_admin=True,
+                ignore_conflicts_on=["election_id", "receipt_hash"]
+            )
+        except Exception:
+            attempt += 1
+            if attempt > max_retries:
+                raise
+            time.sleep(0.5 * 2 ** (attempt - 1))
+
+
+def store_merkle_proofs_bulk(
+    election_id,
+    proofs,
+    chunk_size: int = None,
+    max_workers: int = None,
+    max_retries: int = None
+):
+    """
+    Persists (receipt_hash, proof) pairs using chunked multi-row inserts.
+
+    - At most max_workers chunks are in flight at once
+    - Failed chunks are retried with backoff before giving up
+    - The contiguous prefix of written chunks is checkpointed, so a
+      re-run skips everything already committed. This relies on
+      `proofs` being produced in the same order on every run.
+
+    Returns total number of committed proofs for the election.
+    """
+    chunk_size = chunk_size or Config.MERKLE_PROOF_CHUNK_SIZE
+    max_workers = max_workers or Config.MERKLE_PROOF_WRITE_WORKERS
+    if max_retries is None:
+        max_retries = Config.MERKLE_PROOF_WRITE_RETRIES
+
+    committed = get_committed_proof_count(election_id)
+    remaining = islice(proofs, committed, None)
+
+    in_flight = {}      # future -> (chunk_no, row_count)
+    finished = {}       # chunk_no -> row_count, waiting for earlier chunks
+    next_chunk = 0
+
+    def drain(return_when):
+        nonlocal committed, next_chunk
+
+        done, _ = wait(in_flight, return_when=return_when)
+
+        for future in done:
+            chunk_no, row_count = in_flight.pop(future)
+            future.result()  # re-raises after retries are exhausted
+            finished[chunk_no] = row_count
+
+        advanced = False
+        while next_chunk in finished:
+            committed += finished.pop(next_chunk)
+            next_chunk += 1
+            advanced = True
+
+        if advanced:
+            _save_committed_proof_count(election_id, committed)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for chunk_no, chunk in enumerate(_chunked(remaining, chunk_size)):
+            rows = [_proof_row(election_id, r, p) for r, p in chunk]
+            future = pool.submit(_write_chunk, rows, max_retries)
+            in_flight[future] = (chunk_no, len(rows))
+
+            if len(in_flight) >= max_workers:
+                drain(FIRST_COMPLETED)
+
+        while in_flight:
+            drain(FIRST_COMPLETED)
+
+    return committed
@@ -0,0 +1,164 @@
+# models/vote_outbox.py
+
+from supabase_db.db import (
+    insert_record,
+    iter_all,
+    update_record,
+    update_many,
+    delete_record,
+    count_records
+)
+from utils.helpers import generate_uuid, utc_now
+
+TABLE = "vote_outbox"
+
+# PENDING → SENDING → SUBMITTED → deleted once mined
+# (failed sends, reverted and dropped transactions go back to PENDING;
+# a batch still reverting after OUTBOX_MAX_ATTEMPTS sends is FAILED)
+PENDING = "PENDING"
+SENDING = "SENDING"
+SUBMITTED = "SUBMITTED"
+FAILED = "FAILED"
+
+
+def enqueue_vote(election_id, candidate_id):
+    """
+    Records a vote that still has to be cast on chain.
+
+    No voter or receipt data is stored with it, and its timestamps
+    are cut to the minute so they can't be matched against
+    vote_status.voted_at. The row is deleted once its batch is mined.
+    """
+    now = utc_now().replace(second=0, microsecond=0).isoformat()
+
+    return insert_record(
+        TABLE,
+        {
+            "id": generate_uuid(),
+            "election_id": election_id,
+            "candidate_id": candidate_id,
+            "status": PENDING,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now
+        },
+        use_admin=True
+    )
+
+
+def iter_outbox_entries(status, page_size=1000):
+    """
+    Streams entries in one status, oldest first.
+    """
+    return iter_all(
+        TABLE,
+        {"status": status},
+        key_columns=["created_at", "id"],
+        page_size=page_size,
+        use_admin=True
+    )
+
+
+def count_outbox_entries(status):
+    return count_records(TABLE, {"status": status}, use_admin=True)
+
+
+def count_unsettled_entries(election_id):
+    """
+    Votes of an election that are not on chain yet
+    (PENDING, SENDING, SUBMITTED, or FAILED until an operator
+    requeues or removes them).
+    """
+    return count_records(
+        TABLE,
+        {"election_id": election_id},
+        conditions=[("status", "in", [PENDING, SENDING, SUBMITTED, FAILED])],
+        use_admin=True
+    )
+
+
+def claim_outbox_entries(ids, batch_id, attempts):
+    """
+    Compare-and-set in one UPDATE: moves the entries that are still
+    PENDING to SENDING as part of batch_id; entries another dispatcher
+    took first are left alone. Returns the claimed rows.
+    """
+    return update_many(
+        TABLE,
+        "id",
+        ids,
+        {
+            "status": SENDING,
+            "batch_id": batch_id,
+            "attempts": attempts,
+            "tx_hash": None,
+            "updated_at": utc_now().isoformat()
+        },
+        filters={"status": PENDING},
+        use_admin=True
+    )
+
+
+# Entries sent together share a batch_id (one castVotes transaction),
+# so every later state change is one UPDATE per batch.
+
+def set_batch_tx_hash(batch_id, tx_hash):
+    """
+    Saved after signing and before broadcast, so a crashed send
+    can be looked up on chain instead of being sent twice.
+    """
+    return update_record(
+        TABLE,
+        {"batch_id": batch_id},
+        {"tx_hash": tx_hash, "updated_at": utc_now().isoformat()},
+        use_admin=True
+    )
+
+
+def mark_batch_submitted(batch_id, tx_hash):
+    return update_record(
+        TABLE,
+        {"batch_id": batch_id},
+        {
+            "status": SUBMITTED,
+            "tx_hash": tx_hash,
+            "updated_at": utc_now().isoformat()
+        },
+        use_admin=True
+    )
+
+
+def mark_batch_confirmed(batch_id):
+    """
+    The batch is on chain (the ledger keeps its tx and block):
+    its rows, and the candidate choices in them, are deleted.
+    """
+    return delete_record(TABLE, {"batch_id": batch_id}, use_admin=True)
+
+
+def mark_batch_failed(batch_id, error):
+    return update_record(
+        TABLE,
+        {"batch_id": batch_id},
+        {
+            "status": FAILED,
+            "last_error": error,
+            "updated_at": utc_now().isoformat()
+        },
+        use_admin=True
+    )
+
+
+def requeue_batch(batch_id, error, next_attempt_at):
+    return update_record(
+        TABLE,
+        {"batch_id": batch_id},
+        {
+            "status": PENDING,
+            "last_error": error,
+            "next_attempt_at": next_attempt_at,
+            "updated_at": utc_now().isoformat()
+        },
+        use_admin=True
+    )
@@ -1,4 +1,5 @@
-from supabase_db.db import fetch_all, insert_record
+from config import Config
+from supabase_db.db import fetch_one, fetch_all, iter_all, insert_record, insert_record_if_absent
 
 VOTE_RECEIPTS_TABLE = "vote_receipts"
 
@@ -12,15 +13,82 @@ def store_receipt(election_id: str, receipt_hash: str):
     )
 
 
-def get_all_receipts_for_election(election_id: str):
-    rows = fetch_all(
-        table="vote_receipts",
-        filters={"election_id": election_id},
-        order_by=("created_at", "asc"),
+def claim_receipt_leaf(
+    election_id: str,
+    constituency_id: str,
+    receipt_hash: str,
+    leaf_index: int
+) -> bool:
+    """
+    Stores a receipt at a leaf position of its constituency's
+    Merkle subtree. Returns False if that position is already taken.
+    """
+    rows = insert_record_if_absent(
+        VOTE_RECEIPTS_TABLE,
+        {
+            "election_id": election_id,
+            "constituency_id": constituency_id,
+            "receipt_hash": receipt_hash,
+            "leaf_index": leaf_index,
+        },
+        conflict_columns=["election_id", "constituency_id", "leaf_index"]
+    )
+    return bool(rows)
+
+
+def get_receipt_by_leaf_index(election_id: str, constituency_id: str, leaf_index: int):
+    return fetch_one(
+        VOTE_RECEIPTS_TABLE,
+        {
+            "election_id": election_id,
+            "constituency_id": constituency_id,
+            "leaf_index": leaf_index
+        }
+    )
+
+
+def iter_receipt_hashes_by_election(election_id: str, page_size: int = None):
+    """
+    Streams receipt hashes for an election in (created_at, id) order.
+    Only receipt_hash crosses the wire, one keyset page at a time.
+    """
+    rows = iter_all(
+        VOTE_RECEIPTS_TABLE,
+        {"election_id": election_id},
+        columns=["receipt_hash"],
+        key_columns=["created_at", "id"],
+        page_size=page_size or Config.RECEIPT_PAGE_SIZE
+    )
+
+    for row in rows:
+        yield row["receipt_hash"]
+
+
+def iter_receipt_hashes_by_constituency(
+    election_id: str,
+    constituency_id: str,
+    page_size: int = None
+):
+    """
+    Streams one constituency subtree's receipt hashes in leaf order.
+    """
+    rows = iter_all(
+        VOTE_RECEIPTS_TABLE,
+        {
+            "election_id": election_id,
+            "constituency_id": constituency_id
+        },
         columns=["receipt_hash"],
+        key_columns=["leaf_index"],
+        page_size=page_size or Config.RECEIPT_PAGE_SIZE
     )
 
-    return [row["receipt_hash"] for row in rows]
+    for row in rows:
+        yield row["receipt_hash"]
+
+
+def get_all_receipts_for_election(election_id: str):
+    return list(iter_receipt_hashes_by_election(election_id))
 
 def get_receipts_by_election(election_id):
     """
@@ -1,4 +1,4 @@
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, fetch_all, load_one, insert_record, update_record, invalidate_loaded
 from utils.helpers import generate_uuid,generate_voter_id, utc_now
 from supabase_db.client import supabase_public, supabase_admin
 
@@ -48,7 +48,7 @@ def create_voter(
 
 
 def get_voter_by_id(voter_id: str):
-    return fetch_one(VOTERS_TABLE, {"id": voter_id})
+    return load_one(VOTERS_TABLE, {"id": voter_id})
 
 
 def get_voter_by_voter_id_number(voter_id_number: str):
@@ -60,6 +60,7 @@ def get_voters_by_constituency(constituency_id: str):
 
 
 def update_voter_details(voter_id, data,use_admin=True):
+    invalidate_loaded("voters")
     return (
         supabase_public
         .table("voters")
@@ -95,7 +96,7 @@ def map_voter_to_user(voter_id: str, user_id: str):
 
 
 def get_voter_user_mapping_by_user(user_id: str):
-    return fetch_one(VOTER_USER_MAP_TABLE, {"user_id": user_id})
+    return load_one(VOTER_USER_MAP_TABLE, {"user_id": user_id})
 
 
 def get_voter_user_mapping_by_voter(voter_id: str):
@@ -104,18 +105,16 @@ def get_voter_user_mapping_by_voter(voter_id: str):
 def get_voters_by_booth(booth_id: str):
     return fetch_all(VOTERS_TABLE, {"booth_id": booth_id})
 
-from supabase_db.db import fetch_one
-
 def get_voter_by_user_id(user_id: str):
     """
     Resolve voter using voter_user_map
     """
-    mapping = fetch_one("voter_user_map", {"user_id": user_id})
+    mapping = load_one("voter_user_map", {"user_id": user_id})
 
     if not mapping:
         return None
 
-    return fetch_one("voters", {"id": mapping["voter_id"]})
+    return load_one("voters", {"id": mapping["voter_id"]})
 
 
 def get_user_id_by_voter_id(voter_id: str):
@@ -25,7 +25,7 @@ from services.citizen_service import ensure_citizen_alias
 from models.user import get_user_by_id
 from models.user import get_display_name_by_user_id
 from models.comment_vote import get_comment_score, get_user_comment_vote
-from models.user import get_user_by_id, get_display_name_by_user_id
+from models.user import get_user_by_id, get_display_name_by_user_id, preload_user_profiles
 import cloudinary.uploader
 from models.issue_image import add_issue_image
 from services.score_service import reward_successful_issue_resolution
@@ -475,6 +475,14 @@ def issue_detail(issue_id):
     user_vote = user_vote if user_vote else None
     user_vote = user_vote["vote_type"] if user_vote is not None else 0
     is_issue_owner = issue["created_by"] == session.get("user_id")
+
+    # Load every commenter once (loader cache) before the per-comment lookups
+    def comment_user_ids(comments):
+        for c in comments:
+            yield c["user_id"]
+            yield from comment_user_ids(c.get("replies") or [])
+    preload_user_profiles([issue["created_by"], *comment_user_ids(comments)])
+
     def attach_usernames_to_comments(comments, issue_owner_id):
         for c in comments:
             c["display_name"] = get_display_name_by_user_id(c["user_id"])
@@ -1,6 +1,6 @@
 # routes/evote_routes.py
 
-from flask import Blueprint, render_template, jsonify, session, request, redirect, flash,url_for
+from flask import Blueprint, render_template, jsonify, session, request, redirect, flash,url_for, Response
 from utils.decorators import login_required, role_required
 from services.voting_service import submit_vote
 from models.candidate import  get_candidates_by_election_and_constituency
@@ -9,9 +9,12 @@ from services.booth_session_service import (
     register_voting_terminal,
     is_valid_voting_terminal,
     unregister_voting_terminal,
-    end_voter_session
+    end_voter_session,
+    wait_for_voter
 )
+import time
 import uuid
+from config import Config
 from datetime import datetime
 from models.election import get_election_by_id
 from services.email_service import send_vote_receipt_email
@@ -57,11 +60,11 @@ def waiting():
 
     # ✅ CASE 1: This browser is already the registered terminal (reload)
     if is_valid_voting_terminal(booth_id, terminal_session_id):
-        return render_template("evote/dashboard.html")
+        return render_template("evote/dashboard.html", booth_status_sse=Config.BOOTH_STATUS_SSE)
 
     # ✅ CASE 2: No terminal yet → register this one
     if register_voting_terminal(booth_id, terminal_session_id):
-        return render_template("evote/dashboard.html")
+        return render_template("evote/dashboard.html", booth_status_sse=Config.BOOTH_STATUS_SSE)
 
     # ❌ CASE 3: Another device owns the terminal
     return render_template("evote/terminal_locked.html")
@@ -84,6 +87,58 @@ def booth_status():
     return jsonify({"active": bool(voter_id), "locked": False})
 
 
+# =====================================================
+# PUSH API – Server-Sent Events until voter is authorized
+# =====================================================
+# One held connection per idle terminal instead of a poll every 3s.
+# The stream closes after BOOTH_STATUS_STREAM_SECONDS and the browser's
+# EventSource reconnects on its own. Enabled by BOOTH_STATUS_SSE: a
+# held stream ties up a gunicorn sync worker for its whole lifetime.
+@bp.route("/booth-events")
+@login_required
+@role_required("PO")
+def booth_events():
+    if not Config.BOOTH_STATUS_SSE:
+        return jsonify({"error": "Booth status stream is disabled"}), 404
+
+    booth_id = session.get("booth_id")
+    terminal_session_id = session.get("terminal_session_id")
+
+    def sse(event):
+        return f"event: {event}\ndata: {{}}\n\n"
+
+    def stream():
+        # Reconnect quickly when the stream is recycled
+        yield "retry: 1000\n\n"
+
+        deadline = time.monotonic() + Config.BOOTH_STATUS_STREAM_SECONDS
+
+        while True:
+            # Terminal released by the PO → stop waiting
+            if not is_valid_voting_terminal(booth_id, terminal_session_id):
+                yield sse("locked")
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            if wait_for_voter(booth_id, min(remaining, Config.BOOTH_STATUS_HEARTBEAT_SECONDS)):
+                yield sse("unlocked")
+                return
+
+            yield ": keepalive\n\n"
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 
 # =====================================================
 # VOTING SCREEN (Unlocked when voter is active)
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, abort, jsonify
 from jobs.run_daily_jobs import run_all_daily_scores
+from jobs.chain_index_job import run_chain_index_job
+from jobs.vote_outbox_job import run_vote_outbox_job
+from jobs.tx_confirmation_job import run_tx_confirmation_job
+from jobs.role_sync_job import run_role_sync_job
+from services.tx_confirmation_service import get_confirmation_backlog
 #import os
 
 
@@ -14,4 +19,33 @@ def run_daily_score():
         abort(403)
     '''
     run_all_daily_scores()
-    return jsonify({"status": "ok"})
\ No newline at end of file
+    return jsonify({"status": "ok"})
+
+
+@bp.route("/index-chain-events", methods=["GET"])
+def index_chain_events():
+    steps = run_chain_index_job()
+    return jsonify({"status": "ok", "ranges_indexed": steps})
+
+
+@bp.route("/dispatch-votes", methods=["GET"])
+def dispatch_votes():
+    counts = run_vote_outbox_job()
+    return jsonify({"status": "ok", **counts})
+
+
+@bp.route("/track-confirmations", methods=["GET"])
+def track_confirmations():
+    updated = run_tx_confirmation_job()
+    return jsonify({"status": "ok", "updated": updated})
+
+
+@bp.route("/confirmation-backlog", methods=["GET"])
+def confirmation_backlog():
+    return jsonify(get_confirmation_backlog())
+
+
+@bp.route("/sync-roles", methods=["GET"])
+def sync_roles():
+    report = run_role_sync_job()
+    return jsonify({"status": "ok", **report})
@@ -1,10 +1,19 @@
-from flask import Blueprint, request, jsonify, render_template
-from models.vote_merkle_proof import get_merkle_proof
-from services.blockchain_service import verify_receipt_on_chain
+import json
+import re
+import time
+from itertools import islice
+from flask import Blueprint, request, jsonify, render_template, Response, stream_with_context
+from services.merkle_service import get_receipt_proof, get_receipt_proofs
+from services.blockchain_service import verify_receipt, verify_receipts
 from models.election import get_all_elections
 
 bp = Blueprint("verify_vote", __name__, url_prefix="/verify-vote")
 
+BATCH_VERIFY_CHUNK = 1000
+
+# Receipts are SHA-256 hex digests (utils.crypto.generate_vote_receipt)
+RECEIPT_HASH_RE = re.compile(r"[0-9a-fA-F]{64}")
+
 
 # -------------------------------
 # PAGE: show form
@@ -24,6 +33,8 @@ def verify_vote_check():
 
     election_id = data.get("election_id")
     receipt_hash = data.get("receipt_hash")
+    # Local check against the cached on-chain root unless asked otherwise
+    use_contract = bool(data.get("on_chain"))
 
     if not election_id or not receipt_hash:
         return jsonify({
@@ -31,18 +42,19 @@ def verify_vote_check():
             "message": "Election ID and receipt hash are required"
         }), 400
 
-    record = get_merkle_proof(election_id, receipt_hash)
+    proof = get_receipt_proof(election_id, receipt_hash)
 
-    if not record:
+    if proof is None:
         return jsonify({
             "valid": False,
             "message": "Receipt not found for this election"
         }), 404
 
-    is_valid = verify_receipt_on_chain(
+    is_valid = verify_receipt(
         election_id=election_id,
         receipt_hash=receipt_hash,
-        proof=record["proof"]
+        proof=proof,
+        use_contract=use_contract
     )
 
     if is_valid:
@@ -55,3 +67,132 @@ def verify_vote_check():
         "valid": False,
         "message": "Receipt exists but proof verification failed"
     })
+
+
+# -------------------------------
+# API: verify many receipts
+# -------------------------------
+def _iter_ndjson_receipts(stream):
+    """
+    One receipt per line: {"receipt_hash": "..."}, "..." or a bare hash.
+    Items are yielded as parsed; the caller checks their format.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = line.decode()
+
+        if isinstance(item, dict):
+            item = item.get("receipt_hash")
+
+        if item:
+            yield item
+
+
+def _is_receipt_hash(value):
+    return isinstance(value, str) and bool(RECEIPT_HASH_RE.fullmatch(value))
+
+
+def _is_receipt_hash_list(value):
+    return isinstance(value, list) and all(_is_receipt_hash(item) for item in value)
+
+
+def _chunks(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@bp.route("/check-batch", methods=["POST"])
+def verify_vote_check_batch():
+    """
+    Accepts either
+    - JSON: {"election_id": ..., "receipt_hashes": [...]}
+    - NDJSON (application/x-ndjson) with ?election_id=...
+
+    Streams back one NDJSON line per receipt, followed by a
+    summary line with counts and throughput. NDJSON lines that are
+    not a receipt hash are reported with status "malformed".
+    """
+    if request.mimetype == "application/x-ndjson":
+        election_id = request.args.get("election_id")
+        receipt_hashes = _iter_ndjson_receipts(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            data = {}
+
+        election_id = data.get("election_id")
+        receipt_hashes = data.get("receipt_hashes")
+
+        if not _is_receipt_hash_list(receipt_hashes):
+            return jsonify({
+                "message": "receipt_hashes must be a list of receipt hashes (64 hex characters)"
+            }), 400
+
+    if not election_id:
+        return jsonify({
+            "message": "Election ID is required"
+        }), 400
+
+    def generate():
+        started = time.perf_counter()
+        counts = {"valid": 0, "invalid": 0, "not_found": 0, "malformed": 0}
+
+        for chunk in _chunks(receipt_hashes, BATCH_VERIFY_CHUNK):
+            # Malformed lines never reach the proof lookup
+            well_formed = [r for r in chunk if _is_receipt_hash(r)]
+
+            # One proof lookup + one root read per chunk
+            proofs = get_receipt_proofs(election_id, well_formed)
+            results = verify_receipts(election_id, proofs)
+
+            for receipt_hash in chunk:
+                if not _is_receipt_hash(receipt_hash):
+                    counts["malformed"] += 1
+                    yield json.dumps({
+                        "receipt_hash": receipt_hash,
+                        "valid": False,
+                        "status": "malformed",
+                        "error": "Not a receipt hash (64 hex characters)"
+                    }) + "\n"
+                    continue
+
+                if receipt_hash not in proofs:
+                    status = "not_found"
+                elif results[receipt_hash]:
+                    status = "valid"
+                else:
+                    status = "invalid"
+
+                counts[status] += 1
+                yield json.dumps({
+                    "receipt_hash": receipt_hash,
+                    "valid": status == "valid",
+                    "status": status
+                }) + "\n"
+
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+
+        yield json.dumps({
+            "summary": {
+                "total": total,
+                **counts,
+                "elapsed_seconds": round(elapsed, 3),
+                "receipts_per_second": round(total / elapsed, 1) if elapsed else None
+            }
+        }) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson"
+    )
@@ -1,18 +1,19 @@
-from models.issue import get_issues_by_constituency
+from models.issue import count_issues_by_status
 from models.rep_policy import get_policy_posts_by_constituency
-from models.rep_policy_comments import get_policy_comments
+from models.rep_policy_comments import count_policy_comments
 from models.representative import get_rep_score
 from statistics import mean
 
 
 def calculate_resolution_rate(rep_user_id, constituency_id):
-    issues = get_issues_by_constituency(constituency_id)
-
-    accepted = [i for i in issues if i["status"] in ("Accepted", "In Progress", "Resolved","Closed")]
-    resolved = [i for i in issues if i["status"] == "Closed"]
+    accepted = count_issues_by_status(
+        constituency_id, ["Accepted", "In Progress", "Resolved", "Closed"]
+    )
     if not accepted:
         return 0.0
-    return round(len(resolved) / len(accepted), 2)
+
+    resolved = count_issues_by_status(constituency_id, ["Closed"])
+    return round(resolved / accepted, 2)
 
 
 def calculate_engagement(constituency_id):
@@ -20,10 +21,12 @@ def calculate_engagement(constituency_id):
     if not posts:
         return 0
 
+    # Top-level comments, as counted from the threaded comment tree
+    comment_counts = count_policy_comments([p["id"] for p in posts], roots_only=True)
+
     score = 0
     for p in posts:
-        comments = get_policy_comments(p["id"])
-        score += p["upvotes"] + len(comments)
+        score += p["upvotes"] + comment_counts[p["id"]]
 
     return score
 
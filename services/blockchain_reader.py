@@ -1,35 +1,184 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from eth_hash.auto import keccak
 from web3 import Web3
 from config import Config
 from utils.crypto import uuid_to_uint256
-import json
+from services.chain_client import get_web3
 
 
-def get_votes_from_chain(election_id, constituency_id=None):
-    w3 = Web3(Web3.HTTPProvider(Config.WEB3_PROVIDER_URL))
+# VoteCast(uint256 indexed electionId, uint256 indexed candidateId, uint256 timestamp)
+VOTE_CAST_TOPIC = "0x" + keccak(b"VoteCast(uint256,uint256,uint256)").hex()
 
-    with open("blockchain/abi/VotingContractABI.json") as f:
-        abi = json.load(f)
 
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(Config.VOTING_CONTRACT_ADDRESS),
-        abi=abi
-    )
+def _uint_topic(value: int) -> str:
+    return "0x" + value.to_bytes(32, byteorder="big").hex()
+
+
+def _to_uint(value) -> int:
+    return int.from_bytes(bytes(value), byteorder="big")
+
 
-    election_uint = uuid_to_uint256(election_id)
+# -------------------------------------------------
+# ADAPTIVE LOG FETCHER
+# -------------------------------------------------
+# eth_getLogs over the whole chain is rejected or times out on
+# public RPCs. Ranges are fetched in chunks by a bounded pool:
+# - a range the node says holds too many logs is split in half
+# - any other error (node down, timeout) retries the same range
+#   with backoff, at most CHAIN_LOG_RETRIES times, then raises
+# - the chunk size halves after a crowded response or a split
+#   and doubles after a sparse one
 
-    # ✅ Web3.py v6+ compatible way
-    events = contract.events.VoteCast.get_logs(
-        from_block=0,
-        argument_filters={
-            "electionId": election_uint
+# How providers word "too many logs in this range" (geth, Infura,
+# Alchemy, QuickNode, ...); -32005 is the EIP-1474 limit code
+_TOO_MANY_RESULTS = (
+    "-32005",
+    "more than",
+    "too many",
+    "response size",
+    "limit exceeded",
+    "block range"
+)
+
+
+def _is_too_many_results(error) -> bool:
+    message = str(error).lower()
+    return any(s in message for s in _TOO_MANY_RESULTS)
+
+def _decode_vote_cast_logs(logs):
+    """
+    Bulk decode: both ids are indexed topics and the timestamp is
+    the only data word, so no per-log ABI decoding is needed.
+    """
+    return [
+        {
+            "election_id": _to_uint(log["topics"][1]),
+            "candidate_id": _to_uint(log["topics"][2]),
+            "timestamp": _to_uint(log["data"]),
+            "block_number": log["blockNumber"],
+            "log_index": log["logIndex"],
+            "transaction_hash": log["transactionHash"].to_0x_hex()
         }
+        for log in logs
+    ]
+
+
+def fetch_vote_cast_events(
+    from_block: int,
+    to_block: int,
+    election_uint: int = None,
+    w3=None
+):
+    """
+    Returns decoded VoteCast events in [from_block, to_block],
+    ordered by (block_number, log_index).
+    """
+    w3 = w3 or get_web3()
+
+    topics = [VOTE_CAST_TOPIC]
+    if election_uint is not None:
+        topics.append(_uint_topic(election_uint))
+
+    address = Web3.to_checksum_address(Config.VOTING_CONTRACT_ADDRESS)
+
+    def get_logs(start, end, attempt):
+        if attempt:
+            time.sleep(min(10, 0.5 * 2 ** (attempt - 1)))
+
+        return w3.eth.get_logs({
+            "address": address,
+            "topics": topics,
+            "fromBlock": start,
+            "toBlock": end
+        })
+
+    chunk = Config.CHAIN_LOG_CHUNK_BLOCKS
+    target = Config.CHAIN_LOG_TARGET_LOGS
+
+    next_block = from_block
+    retry = deque()     # ranges split or retried after an error
+    attempts = {}       # (start, end) -> failures other than too many logs
+    in_flight = {}      # future -> (start, end)
+    logs = []
+
+    with ThreadPoolExecutor(max_workers=Config.CHAIN_LOG_WORKERS) as pool:
+        while next_block <= to_block or retry or in_flight:
+
+            while len(in_flight) < Config.CHAIN_LOG_WORKERS and (retry or next_block <= to_block):
+                if retry:
+                    start, end = retry.popleft()
+                else:
+                    start = next_block
+                    end = min(start + chunk - 1, to_block)
+                    next_block = end + 1
+
+                attempt = attempts.get((start, end), 0)
+                in_flight[pool.submit(get_logs, start, end, attempt)] = (start, end)
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                start, end = in_flight.pop(future)
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    if _is_too_many_results(e) and start < end:
+                        chunk = max(1, chunk // 2)
+                        mid = (start + end) // 2
+                        retry.extend([(start, mid), (mid + 1, end)])
+                        continue
+
+                    attempts[(start, end)] = attempts.get((start, end), 0) + 1
+                    if attempts[(start, end)] > Config.CHAIN_LOG_RETRIES:
+                        raise
+                    retry.append((start, end))
+                    continue
+
+                logs.extend(result)
+
+                if len(result) > target:
+                    chunk = max(1, chunk // 2)
+                elif len(result) < target // 4:
+                    chunk = min(Config.CHAIN_LOG_MAX_CHUNK_BLOCKS, chunk * 2)
+
+    logs.sort(key=lambda log: (log["blockNumber"], log["logIndex"]))
+
+    return _decode_vote_cast_logs(logs)
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+
+def get_vote_cast_events(election_id):
+    """
+    All decoded VoteCast events of an election, deploy block → head.
+    """
+    # Scanning from genesis would walk the whole chain
+    if not Config.VOTING_CONTRACT_DEPLOY_BLOCK:
+        raise ValueError("VOTING_CONTRACT_DEPLOY_BLOCK is not set")
+
+    w3 = get_web3()
+
+    return fetch_vote_cast_events(
+        from_block=Config.VOTING_CONTRACT_DEPLOY_BLOCK,
+        to_block=w3.eth.block_number,
+        election_uint=uuid_to_uint256(election_id),
+        w3=w3
     )
 
+
+def get_votes_from_chain(election_id, constituency_id=None):
+    events = get_vote_cast_events(election_id)
+
     results = []
     for e in events:
         results.append({
-            "candidate_id": str(e["args"]["candidateId"]),
-            "timestamp": e["args"]["timestamp"]
+            "candidate_id": str(e["candidate_id"]),
+            "timestamp": e["timestamp"]
         })
 
     return results
@@ -1,36 +1,57 @@
 # services/blockchain_service.py
 
 import hashlib
+import time
 from datetime import datetime
 from config import Config
-from utils.crypto import uuid_to_uint256
+from utils.crypto import uuid_to_uint256, candidate_id_to_uint
+from utils.merkle import verify_merkle_proof
+from services.chain_client import get_web3, get_contract, get_signer, get_gas_price
+from services.nonce_manager import send_with_nonce
 from web3 import Web3
 
 
 BLOCKCHAIN_MODE = Config.BLOCKCHAIN_MODE
 
+MERKLE_ROOT_CACHE = {}  # election_id -> (root_hex, fetched_at)
+
+
+def _0x(tx_hash):
+    # Hashes stored before to_0x_hex() was used have no prefix
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
 
 # -------------------------------------------------
 # STUB IMPLEMENTATION
 # -------------------------------------------------
 
 def _stub_cast_vote(election_id, candidate_id, receipt_hash):
-    raw = f"{uuid_to_uint256(election_id)}|{uuid_to_uint256(candidate_id)}|{receipt_hash}|{datetime.utcnow().isoformat()}"
+    raw = f"{uuid_to_uint256(election_id)}|{candidate_id_to_uint(candidate_id)}|{receipt_hash}|{datetime.utcnow().isoformat()}"
     fake_tx_hash = "0x" + hashlib.sha256(raw.encode()).hexdigest()
     return fake_tx_hash
 
 
+def _stub_cast_votes(election_id, candidate_ids):
+    raw = f"{uuid_to_uint256(election_id)}|{len(candidate_ids)}|{datetime.utcnow().isoformat()}"
+    return "0x" + hashlib.sha256(raw.encode()).hexdigest()
+
+
 # -------------------------------------------------
 # PUBLIC API
 # -------------------------------------------------
 
-def cast_vote_on_chain(election_id, candidate_id, receipt_hash):
+def cast_vote_on_chain(election_id, candidate_id, receipt_hash, on_signed=None):
+    """
+    on_signed(tx_hash): called with the signed transaction's hash
+    right before it is broadcast (WEB3 mode), so callers can record
+    it durably first.
+    """
     print("BLOCKCHAIN_MODE =", BLOCKCHAIN_MODE)
     if BLOCKCHAIN_MODE == "STUB":
         return _stub_cast_vote(election_id, candidate_id, receipt_hash)
 
     if BLOCKCHAIN_MODE == "WEB3":
-        return _web3_cast_vote(election_id, candidate_id, receipt_hash)
+        return _web3_cast_vote(election_id, candidate_id, receipt_hash, on_signed)
 
     raise Exception("Invalid BLOCKCHAIN_MODE configuration")
 
@@ -39,155 +60,207 @@ def cast_vote_on_chain(election_id, candidate_id, receipt_hash):
 # REAL WEB3 IMPLEMENTATION
 # -------------------------------------------------
 
-def _web3_cast_vote(election_id, candidate_id, receipt_hash):
-    from web3 import Web3
-    import json
-
-    WEB3_PROVIDER = Config.WEB3_PROVIDER_URL
-    CONTRACT_ADDRESS = Config.VOTING_CONTRACT_ADDRESS
-    BOOTH_PRIVATE_KEY = Config.BOOTH_PRIVATE_KEY
+def _web3_cast_vote(election_id, candidate_id, receipt_hash, on_signed=None):
+    # Shared client: no per-ballot connection / ABI / contract setup
+    w3 = get_web3()
+    contract = get_contract()
+    account = get_signer()
+
+    # 🔑 Receipt is never sent on chain; only sanity-checked when given
+    # (the vote outbox doesn't keep receipts next to candidates)
+    if receipt_hash:
+        receipt_bytes32 = Web3.to_bytes(hexstr=receipt_hash)
+        assert len(receipt_bytes32) == 32
+        print('after:',receipt_bytes32)
+    print('election_id:', election_id)
+    print('candidate_id:', candidate_id)
 
-    if not all([WEB3_PROVIDER, CONTRACT_ADDRESS, BOOTH_PRIVATE_KEY]):
-        raise Exception("Blockchain configuration missing")
+    call = contract.functions.castVote(
+        uuid_to_uint256(election_id),
+        candidate_id_to_uint(candidate_id)
+    )
 
-    w3 = Web3(Web3.HTTPProvider(WEB3_PROVIDER))
+    # Nonce allocated locally, gas price cached → no per-vote RPC reads
+    def sign_and_send(nonce):
+        txn = call.build_transaction({
+            "from": account.address,
+            "nonce": nonce,
+            "chainId": Config.CHAIN_ID,
+            "gas": 300000,
+            "gasPrice": get_gas_price()
+        })
 
-    if not w3.is_connected():
-        raise Exception("Blockchain node not reachable")
+        signed_txn = account.sign_transaction(txn)
+        if on_signed:
+            on_signed(signed_txn.hash.to_0x_hex())
 
-    # Load ABI
-    with open("blockchain/abi/VotingContractABI.json") as f:
-        abi = json.load(f)
+        return w3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-        abi=abi
-    )
+    tx_hash = send_with_nonce(w3, account.address, sign_and_send)
 
-    account = w3.eth.account.from_key(BOOTH_PRIVATE_KEY)
-    nonce = w3.eth.get_transaction_count(account.address)
-    # 🔑 Convert receipt hash → bytes32
-    receipt_bytes32 = Web3.to_bytes(hexstr=receipt_hash)
-    assert len(receipt_bytes32) == 32
-    print('after:',receipt_bytes32)
-    print('election_id:', election_id)
-    print('candidate_id:', candidate_id)
-    txn = contract.functions.castVote(
-        uuid_to_uint256(election_id),
-        uuid_to_uint256(candidate_id)
-    ).build_transaction({
-        "from": account.address,
-        "nonce": nonce,
-        "chainId": 11155111,   # Sepolia
-        "gas": 300000,
-        "gasPrice": w3.eth.gas_price
-    })
-
-    signed_txn = w3.eth.account.sign_transaction(txn, BOOTH_PRIVATE_KEY)
-    tx_hash = w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-
-    return tx_hash.hex()
+    return tx_hash.to_0x_hex()
     
-def count_votes_from_blockchain(election_id: str) -> dict:
+def cast_votes_on_chain(election_id, candidate_ids, on_signed=None):
     """
-    Counts votes for an election by reading VoteCast events
-    from the blockchain.
+    Casts many votes of one election in a single castVotes
+    transaction (one VoteCast event per vote).
+    on_signed: see cast_vote_on_chain()
     """
+    if BLOCKCHAIN_MODE == "STUB":
+        return _stub_cast_votes(election_id, candidate_ids)
 
-    from web3 import Web3
-    import json
-    from utils.crypto import uuid_to_uint256
+    if BLOCKCHAIN_MODE == "WEB3":
+        return _web3_cast_votes(election_id, candidate_ids, on_signed)
 
-    WEB3_PROVIDER = Config.WEB3_PROVIDER_URL
-    CONTRACT_ADDRESS = Config.VOTING_CONTRACT_ADDRESS
+    raise Exception("Invalid BLOCKCHAIN_MODE configuration")
 
-    w3 = Web3(Web3.HTTPProvider(WEB3_PROVIDER))
 
-    with open("blockchain/abi/VotingContractABI.json") as f:
-        abi = json.load(f)
+def _web3_cast_votes(election_id, candidate_ids, on_signed=None):
+    w3 = get_web3()
+    contract = get_contract()
+    account = get_signer()
 
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-        abi=abi
+    call = contract.functions.castVotes(
+        uuid_to_uint256(election_id),
+        [candidate_id_to_uint(c) for c in candidate_ids]
     )
 
-    election_uint = uuid_to_uint256(election_id)
+    def sign_and_send(nonce):
+        txn = call.build_transaction({
+            "from": account.address,
+            "nonce": nonce,
+            "chainId": Config.CHAIN_ID,
+            # Base cost + one event (~2k gas) and calldata word per vote
+            "gas": 60000 + 5000 * len(candidate_ids),
+            "gasPrice": get_gas_price()
+        })
 
-    # 🔍 Fetch all VoteCast events for this election
-    events = contract.events.VoteCast.get_logs(
-        fromBlock=0,
-        toBlock="latest",
-        argument_filters={
-            "electionId": election_uint
-        }
-    )
+        signed_txn = account.sign_transaction(txn)
+        if on_signed:
+            on_signed(signed_txn.hash.to_0x_hex())
 
-    results = {}
+        return w3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
-    for event in events:
-        candidate_id = event["args"]["candidateId"]
+    tx_hash = send_with_nonce(w3, account.address, sign_and_send)
 
-        results[candidate_id] = results.get(candidate_id, 0) + 1
+    return tx_hash.to_0x_hex()
 
-    return results
 
-def publish_merkle_root_on_chain(election_id, merkle_root):
+def get_transaction_status(tx_hash):
+    """
+    Returns (status, block_number) for a submitted transaction:
+    - ("CONFIRMED", block)  mined and succeeded
+    - ("REVERTED", block)   mined and failed
+    - ("PENDING", None)     known to the node, not mined yet
+    - ("UNKNOWN", None)     the node has never seen it (dropped)
+    """
     if BLOCKCHAIN_MODE == "STUB":
-        print(f"[STUB] Published Merkle Root for election {election_id}: {merkle_root}")
-        return True
+        return "CONFIRMED", None
 
-    from web3 import Web3
-    import json
+    if BLOCKCHAIN_MODE == "WEB3":
+        from web3.exceptions import TransactionNotFound
 
-    w3 = Web3(Web3.HTTPProvider(Config.WEB3_PROVIDER_URL))
+        w3 = get_web3()
 
-    with open("blockchain/abi/VotingContractABI.json") as f:
-        abi = json.load(f)
+        tx_hash = _0x(tx_hash)
 
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(Config.VOTING_CONTRACT_ADDRESS),
-        abi=abi
-    )
+        try:
+            receipt = w3.eth.get_transaction_receipt(tx_hash)
+            status = "CONFIRMED" if receipt["status"] == 1 else "REVERTED"
+            return status, receipt["blockNumber"]
+        except TransactionNotFound:
+            pass
 
-    account = w3.eth.account.from_key(Config.BOOTH_PRIVATE_KEY)
-    nonce = w3.eth.get_transaction_count(account.address)
+        try:
+            w3.eth.get_transaction(tx_hash)
+            return "PENDING", None
+        except TransactionNotFound:
+            return "UNKNOWN", None
 
-    txn = contract.functions.publishMerkleRoot(
-        uuid_to_uint256(election_id),
-        Web3.to_bytes(hexstr=merkle_root)
-    ).build_transaction({
-        "from": account.address,
-        "nonce": nonce,
-        "chainId": 11155111,
-        "gas": 200000,
-        "gasPrice": w3.eth.gas_price
-    })
+    raise Exception("Invalid BLOCKCHAIN_MODE")
 
-    signed = w3.eth.account.sign_transaction(txn, Config.BOOTH_PRIVATE_KEY)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
 
-    return tx_hash.hex()
+def get_transaction_receipts(tx_hashes):
+    """
+    eth_getTransactionReceipt for many transactions, sent as JSON-RPC
+    batches of TX_RECEIPT_BATCH_SIZE.
 
-def _web3_verify_receipt(election_id, receipt_hash, proof):
-    from web3 import Web3
-    import json
-    from config import Config
-    from utils.crypto import uuid_to_uint256
+    Returns {tx_hash: (status, block_number)} for mined transactions
+    ("CONFIRMED" / "REVERTED"), keyed by the hashes as given; unmined
+    hashes, and hashes the node answered with an error, are absent.
+    """
+    tx_hashes = list(tx_hashes)
+
+    if BLOCKCHAIN_MODE == "STUB":
+        return {h: ("CONFIRMED", None) for h in tx_hashes}
 
-    w3 = Web3(Web3.HTTPProvider(Config.WEB3_PROVIDER_URL))
+    if BLOCKCHAIN_MODE == "WEB3":
+        provider = get_web3().provider
+        size = Config.TX_RECEIPT_BATCH_SIZE
+        results = {}
+
+        for i in range(0, len(tx_hashes), size):
+            chunk = tx_hashes[i:i + size]
+            # Raw batch requests skip web3's input formatters
+            responses = provider.make_batch_request([
+                ("eth_getTransactionReceipt", [_0x(h)]) for h in chunk
+            ])
+
+            # A failed batch comes back as one error object
+            if not isinstance(responses, list):
+                raise Exception(f"Receipt batch failed: {responses.get('error')}")
+
+            for tx_hash, response in zip(chunk, responses):
+                if response.get("error"):
+                    print(f"Receipt lookup failed for {tx_hash}: {response['error']}")
+                    continue
 
-    if not w3.is_connected():
-        raise Exception("Blockchain node not reachable")
+                receipt = response.get("result")
+                if not receipt:
+                    continue
 
-    # Load ABI
-    with open("blockchain/abi/VotingContractABI.json") as f:
-        abi = json.load(f)
+                status = "CONFIRMED" if int(receipt["status"], 16) == 1 else "REVERTED"
+                results[tx_hash] = (status, int(receipt["blockNumber"], 16))
+
+        return results
+
+    raise Exception("Invalid BLOCKCHAIN_MODE")
+
+
+def publish_merkle_root_on_chain(election_id, merkle_root):
+    if BLOCKCHAIN_MODE == "STUB":
+        print(f"[STUB] Published Merkle Root for election {election_id}: {merkle_root}")
+        return True
 
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(Config.VOTING_CONTRACT_ADDRESS),
-        abi=abi
+    w3 = get_web3()
+    contract = get_contract()
+
+    account = get_signer()
+
+    call = contract.functions.publishMerkleRoot(
+        uuid_to_uint256(election_id),
+        Web3.to_bytes(hexstr=merkle_root)
     )
 
+    def sign_and_send(nonce):
+        txn = call.build_transaction({
+            "from": account.address,
+            "nonce": nonce,
+            "chainId": Config.CHAIN_ID,
+            "gas": 200000,
+            "gasPrice": get_gas_price()
+        })
+
+        signed = account.sign_transaction(txn)
+        return w3.eth.send_raw_transaction(signed.raw_transaction)
+
+    tx_hash = send_with_nonce(w3, account.address, sign_and_send)
+
+    return tx_hash.to_0x_hex()
+
+def _web3_verify_receipt(election_id, receipt_hash, proof):
+    contract = get_contract()
+
     # Convert values to correct Solidity types
     election_uint = uuid_to_uint256(election_id)
     receipt_bytes32 = Web3.to_bytes(hexstr=receipt_hash)
@@ -216,3 +289,82 @@ def verify_receipt_on_chain(election_id, receipt_hash, proof):
     raise Exception("Invalid BLOCKCHAIN_MODE")
 
 
+# -------------------------------------------------
+# LOCAL VERIFICATION (FAST PATH)
+# -------------------------------------------------
+
+def _web3_get_merkle_root(election_id):
+    contract = get_contract()
+
+    root = contract.functions.electionMerkleRoot(
+        uuid_to_uint256(election_id)
+    ).call()
+
+    return root.hex()
+
+
+def get_published_merkle_root(election_id):
+    """
+    Merkle root published on-chain for an election, or None.
+    Cached per election for MERKLE_ROOT_CACHE_TTL seconds.
+    """
+    cached = MERKLE_ROOT_CACHE.get(election_id)
+    if cached and time.monotonic() - cached[1] < Config.MERKLE_ROOT_CACHE_TTL:
+        return cached[0]
+
+    root = _web3_get_merkle_root(election_id)
+
+    # Unpublished roots read as bytes32(0); don't cache those
+    if not root or int(root, 16) == 0:
+        return None
+
+    MERKLE_ROOT_CACHE[election_id] = (root, time.monotonic())
+    return root
+
+
+def verify_receipt(election_id, receipt_hash, proof, use_contract=False):
+    """
+    Verifies a vote receipt against the election's on-chain root.
+
+    Checks the proof locally against the cached root; the contract's
+    verifyReceipt is only called when use_contract=True.
+    """
+
+    if BLOCKCHAIN_MODE == "STUB":
+        print("[STUB] Verifying receipt:", receipt_hash)
+        return True
+
+    if BLOCKCHAIN_MODE == "WEB3":
+        if use_contract:
+            return _web3_verify_receipt(election_id, receipt_hash, proof)
+
+        root = get_published_merkle_root(election_id)
+        if not root:
+            return False
+
+        return verify_merkle_proof(receipt_hash, proof, root)
+
+    raise Exception("Invalid BLOCKCHAIN_MODE")
+
+
+def verify_receipts(election_id, proofs):
+    """
+    Batch local verification.
+
+    proofs: {receipt_hash: proof}
+    Returns {receipt_hash: bool}, reading the on-chain root at most once.
+    """
+
+    if BLOCKCHAIN_MODE == "STUB":
+        print(f"[STUB] Verifying {len(proofs)} receipts")
+        return {receipt_hash: True for receipt_hash in proofs}
+
+    if BLOCKCHAIN_MODE == "WEB3":
+        root = get_published_merkle_root(election_id)
+
+        return {
+            receipt_hash: bool(root) and verify_merkle_proof(receipt_hash, proof, root)
+            for receipt_hash, proof in proofs.items()
+        }
+
+    raise Exception("Invalid BLOCKCHAIN_MODE")
@@ -1,7 +1,14 @@
-from datetime import datetime
+import threading
+import time
 
-BOOTH_SESSIONS = {}
-ACTIVE_VOTING_TERMINAL = {}  # booth_id -> terminal_session_id
+from config import Config
+from services.booth_session_store import create_session_store
+
+# Backend chosen by BOOTH_SESSION_STORE (see booth_session_store)
+STORE = create_session_store()
+
+# Wakes booth status streams in this worker when a voter is authorized
+VOTER_STARTED = threading.Condition()
 
 
 # =====================================================
@@ -13,11 +20,7 @@ def register_voting_terminal(booth_id, session_id):
     Register a voting terminal for a booth.
     Only ONE terminal allowed per booth.
     """
-    if booth_id in ACTIVE_VOTING_TERMINAL:
-        return False
-
-    ACTIVE_VOTING_TERMINAL[booth_id] = session_id
-    return True
+    return STORE.register_terminal(booth_id, session_id)
 
 
 def unregister_voting_terminal(booth_id):
@@ -25,14 +28,14 @@ def unregister_voting_terminal(booth_id):
     FORCE release terminal lock for a booth.
     Presiding Officer authority.
     """
-    ACTIVE_VOTING_TERMINAL.pop(booth_id, None)
+    STORE.unregister_terminal(booth_id)
 
 
 def is_valid_voting_terminal(booth_id, session_id):
     """
     Check if this browser session is the active voting terminal.
     """
-    return ACTIVE_VOTING_TERMINAL.get(booth_id) == session_id
+    return STORE.get_terminal(booth_id) == session_id
 
 
 # =====================================================
@@ -40,19 +43,41 @@ def is_valid_voting_terminal(booth_id, session_id):
 # =====================================================
 
 def start_voter_session(booth_id, voter_id):
-    BOOTH_SESSIONS[booth_id] = {
-        "voter_id": voter_id,
-        "status": "ACTIVE",
-        "started_at": datetime.utcnow().isoformat()
-    }
+    STORE.start_voter_session(booth_id, voter_id)
+
+    with VOTER_STARTED:
+        VOTER_STARTED.notify_all()
 
 
 def end_voter_session(booth_id):
-    BOOTH_SESSIONS.pop(booth_id, None)
+    STORE.end_voter_session(booth_id)
 
 
 def get_active_voter(booth_id):
-    session = BOOTH_SESSIONS.get(booth_id)
+    session = STORE.get_voter_session(booth_id)
     if session and session["status"] == "ACTIVE":
         return session["voter_id"]
     return None
+
+
+def wait_for_voter(booth_id, timeout):
+    """
+    Blocks until a voter is active at the booth, up to timeout seconds.
+    Returns the voter_id, or None on timeout.
+
+    Authorizations in this worker wake the wait at once; ones made in
+    another worker are seen within BOOTH_STATUS_CHECK_SECONDS.
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        voter_id = get_active_voter(booth_id)
+        if voter_id:
+            return voter_id
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+
+        with VOTER_STARTED:
+            VOTER_STARTED.wait(min(remaining, Config.BOOTH_STATUS_CHECK_SECONDS))
@@ -0,0 +1,158 @@
+# services/booth_session_store.py
+
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+
+
+# =====================================================
+# Booth Session Stores
+# =====================================================
+# Both stores keep:
+# - one voting terminal per booth (registration is compare-and-set)
+# - at most one voter session per booth, expiring after
+#   BOOTH_SESSION_TTL seconds
+#
+# MEMORY only works with a single worker process. SQLITE shares one
+# WAL-mode database file between every worker on the host.
+
+class MemorySessionStore:
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.terminals = {}       # booth_id -> terminal_session_id
+        self.voter_sessions = {}  # booth_id -> session dict
+
+    def register_terminal(self, booth_id, session_id):
+        with self.lock:
+            if booth_id in self.terminals:
+                return False
+            self.terminals[booth_id] = session_id
+            return True
+
+    def unregister_terminal(self, booth_id):
+        with self.lock:
+            self.terminals.pop(booth_id, None)
+
+    def get_terminal(self, booth_id):
+        return self.terminals.get(booth_id)
+
+    def start_voter_session(self, booth_id, voter_id):
+        with self.lock:
+            self.voter_sessions[booth_id] = {
+                "voter_id": voter_id,
+                "status": "ACTIVE",
+                "started_at": datetime.utcnow().isoformat(),
+                "expires_at": time.time() + self.ttl
+            }
+
+    def end_voter_session(self, booth_id):
+        with self.lock:
+            self.voter_sessions.pop(booth_id, None)
+
+    def get_voter_session(self, booth_id):
+        session = self.voter_sessions.get(booth_id)
+        if session and session["expires_at"] <= time.time():
+            self.end_voter_session(booth_id)
+            return None
+        return session
+
+
+class SQLiteSessionStore:
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS voting_terminals (
+            booth_id TEXT PRIMARY KEY,
+            session_id TEXT NOT NULL,
+            registered_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS voter_sessions (
+            booth_id TEXT PRIMARY KEY,
+            voter_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path, ttl):
+        self.path = path
+        self.ttl = ttl
+        self.local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self):
+        # One connection per thread; autocommit, so every statement
+        # is its own atomic transaction
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self.local.conn = conn
+        return conn
+
+    def register_terminal(self, booth_id, session_id):
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO voting_terminals VALUES (?, ?, ?)",
+            (booth_id, session_id, datetime.utcnow().isoformat())
+        )
+        return cursor.rowcount == 1
+
+    def unregister_terminal(self, booth_id):
+        self._connect().execute(
+            "DELETE FROM voting_terminals WHERE booth_id = ?", (booth_id,)
+        )
+
+    def get_terminal(self, booth_id):
+        row = self._connect().execute(
+            "SELECT session_id FROM voting_terminals WHERE booth_id = ?",
+            (booth_id,)
+        ).fetchone()
+        return row["session_id"] if row else None
+
+    def start_voter_session(self, booth_id, voter_id):
+        conn = self._connect()
+        now = time.time()
+
+        # Idle sessions of every booth are purged lazily here
+        conn.execute("DELETE FROM voter_sessions WHERE expires_at <= ?", (now,))
+        conn.execute(
+            "INSERT OR REPLACE INTO voter_sessions VALUES (?, ?, ?, ?, ?)",
+            (booth_id, voter_id, "ACTIVE", datetime.utcnow().isoformat(), now + self.ttl)
+        )
+
+    def end_voter_session(self, booth_id):
+        self._connect().execute(
+            "DELETE FROM voter_sessions WHERE booth_id = ?", (booth_id,)
+        )
+
+    def get_voter_session(self, booth_id):
+        row = self._connect().execute(
+            "SELECT voter_id, status, started_at FROM voter_sessions "
+            "WHERE booth_id = ? AND expires_at > ?",
+            (booth_id, time.time())
+        ).fetchone()
+        return dict(row) if row else None
+
+
+def create_session_store():
+    if Config.BOOTH_SESSION_STORE == "MEMORY":
+        return MemorySessionStore(Config.BOOTH_SESSION_TTL)
+
+    if Config.BOOTH_SESSION_STORE == "SQLITE":
+        return SQLiteSessionStore(Config.BOOTH_SESSION_DB, Config.BOOTH_SESSION_TTL)
+
+    raise Exception("Invalid BOOTH_SESSION_STORE configuration")
@@ -0,0 +1,129 @@
+# services/chain_client.py
+
+import json
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from config import Config
+
+
+# -------------------------------------------------
+# PROCESS-WIDE CHAIN CLIENT
+# -------------------------------------------------
+# One Web3 instance over a pooled requests.Session, the contract ABI
+# parsed once and one contract object, all created on first use.
+# Web3 and requests sessions are safe to share between threads.
+
+_LOCK = threading.Lock()
+
+_WEB3 = None
+_ABI = None
+_CONTRACT = None
+_SIGNER = None
+
+GAS_PRICE_CACHE = {}  # "price" -> (wei, fetched_at)
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=Config.WEB3_HTTP_POOL_SIZE,
+        pool_maxsize=Config.WEB3_HTTP_POOL_SIZE
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_web3():
+    global _WEB3
+
+    if _WEB3 is None:
+        with _LOCK:
+            if _WEB3 is None:
+                if not Config.WEB3_PROVIDER_URL:
+                    raise Exception("Blockchain configuration missing")
+
+                _WEB3 = Web3(Web3.HTTPProvider(
+                    Config.WEB3_PROVIDER_URL,
+                    request_kwargs={"timeout": Config.WEB3_HTTP_TIMEOUT},
+                    session=_new_session()
+                ))
+
+    return _WEB3
+
+
+def get_abi():
+    global _ABI
+
+    if _ABI is None:
+        with open(Config.VOTING_CONTRACT_ABI_PATH) as f:
+            _ABI = json.load(f)
+
+    return _ABI
+
+
+def get_contract():
+    global _CONTRACT
+
+    if _CONTRACT is None:
+        w3 = get_web3()
+        abi = get_abi()
+
+        with _LOCK:
+            if _CONTRACT is None:
+                if not Config.VOTING_CONTRACT_ADDRESS:
+                    raise Exception("Blockchain configuration missing")
+
+                _CONTRACT = w3.eth.contract(
+                    address=Web3.to_checksum_address(Config.VOTING_CONTRACT_ADDRESS),
+                    abi=abi
+                )
+
+    return _CONTRACT
+
+
+def get_signer():
+    """
+    Booth signing account (BOOTH_PRIVATE_KEY).
+    """
+    global _SIGNER
+
+    if _SIGNER is None:
+        if not Config.BOOTH_PRIVATE_KEY:
+            raise Exception("Blockchain configuration missing")
+
+        _SIGNER = get_web3().eth.account.from_key(Config.BOOTH_PRIVATE_KEY)
+
+    return _SIGNER
+
+
+def get_gas_price():
+    """
+    Node gas price, reused for GAS_PRICE_TTL seconds so many votes
+    per block don't each cost an eth_gasPrice call.
+    """
+    cached = GAS_PRICE_CACHE.get("price")
+    if cached and time.monotonic() - cached[1] < Config.GAS_PRICE_TTL:
+        return cached[0]
+
+    price = get_web3().eth.gas_price
+    GAS_PRICE_CACHE["price"] = (price, time.monotonic())
+
+    return price
+
+
+def reset_chain_client():
+    """
+    Drops the cached client, e.g. after the provider URL or
+    contract address changed.
+    """
+    global _WEB3, _ABI, _CONTRACT, _SIGNER
+
+    with _LOCK:
+        _WEB3 = _ABI = _CONTRACT = _SIGNER = None
+        GAS_PRICE_CACHE.clear()
@@ -0,0 +1,178 @@
+# services/chain_index_service.py
+
+from collections import defaultdict
+from config import Config
+from utils.crypto import uuid_to_uint256
+from services.chain_client import get_web3
+from services.blockchain_reader import fetch_vote_cast_events
+from models.chain_vote_index import (
+    get_index_checkpoint,
+    save_index_checkpoint,
+    get_vote_tallies,
+    save_vote_tallies
+)
+
+
+VOTE_CAST_STREAM = "VoteCast"
+
+
+# -------------------------------------------------
+# INDEXER
+# -------------------------------------------------
+# Tails VoteCast events in bounded block ranges and keeps per
+# (electionId, candidateId) vote counts in chain_vote_tallies.
+#
+# Every tally row records the last block it has counted, and only
+# events above that block are added to it. A range that is re-read
+# after a crash (tallies saved, checkpoint not) is therefore not
+# double counted.
+
+def _next_block(checkpoint):
+    if checkpoint is not None:
+        return checkpoint + 1
+
+    # Scanning from genesis would walk the whole chain in one request
+    if not Config.VOTING_CONTRACT_DEPLOY_BLOCK:
+        raise ValueError("VOTING_CONTRACT_DEPLOY_BLOCK is not set")
+
+    return Config.VOTING_CONTRACT_DEPLOY_BLOCK
+
+
+def index_vote_events_once(w3=None, confirmations=None):
+    """
+    Indexes the next bounded block range, staying `confirmations`
+    blocks behind head (CHAIN_INDEX_CONFIRMATIONS by default).
+
+    Returns (from_block, to_block) that was processed,
+    or None if the index is already at the safe head.
+    """
+    w3 = w3 or get_web3()
+
+    from_block = _next_block(get_index_checkpoint(VOTE_CAST_STREAM))
+
+    if confirmations is None:
+        confirmations = Config.CHAIN_INDEX_CONFIRMATIONS
+
+    # Stay behind head so reorged blocks are never indexed
+    safe_head = w3.eth.block_number - confirmations
+    if from_block > safe_head:
+        return None
+
+    to_block = min(from_block + Config.CHAIN_INDEX_BLOCK_RANGE - 1, safe_head)
+
+    events = fetch_vote_cast_events(from_block, to_block, w3=w3)
+
+    # (election_uint, candidate_uint) -> [block numbers]
+    blocks_by_key = defaultdict(list)
+    for e in events:
+        key = (str(e["election_id"]), str(e["candidate_id"]))
+        blocks_by_key[key].append(e["block_number"])
+
+    rows = []
+    for election_uint in {key[0] for key in blocks_by_key}:
+        existing = {
+            r["candidate_uint"]: r for r in get_vote_tallies(election_uint)
+        }
+
+        for (e_uint, candidate_uint), blocks in blocks_by_key.items():
+            if e_uint != election_uint:
+                continue
+
+            row = existing.get(candidate_uint)
+            last_block = row["last_block"] if row else -1
+            votes = row["votes"] if row else 0
+
+            new_votes = sum(1 for b in blocks if b > last_block)
+            if not new_votes:
+                continue
+
+            rows.append({
+                "election_uint": election_uint,
+                "candidate_uint": candidate_uint,
+                "votes": votes + new_votes,
+                "last_block": to_block
+            })
+
+    save_vote_tallies(rows)
+    save_index_checkpoint(VOTE_CAST_STREAM, to_block)
+
+    return from_block, to_block
+
+
+def get_vote_index_lag(w3=None):
+    """
+    Blocks between the index checkpoint and the safe head
+    (0 once the indexer has caught up, or outside WEB3 mode).
+    """
+    if Config.BLOCKCHAIN_MODE != "WEB3":
+        return 0
+
+    w3 = w3 or get_web3()
+    safe_head = w3.eth.block_number - Config.CHAIN_INDEX_CONFIRMATIONS
+    from_block = _next_block(get_index_checkpoint(VOTE_CAST_STREAM))
+
+    return max(0, safe_head - from_block + 1)
+
+
+def is_vote_index_current():
+    """
+    True when the index is at most one CHAIN_INDEX_BLOCK_RANGE behind
+    the safe head, so an unconfirmed read on top of it stays small.
+    """
+    return get_vote_index_lag() <= Config.CHAIN_INDEX_BLOCK_RANGE
+
+
+def sync_vote_index(confirmations=None):
+    """
+    Runs the indexer until it reaches the safe head.
+    Returns the number of block ranges processed.
+    """
+    if Config.BLOCKCHAIN_MODE != "WEB3":
+        return 0
+
+    w3 = get_web3()
+    steps = 0
+
+    while index_vote_events_once(w3, confirmations):
+        steps += 1
+
+    return steps
+
+
+# -------------------------------------------------
+# READ API
+# -------------------------------------------------
+
+def get_indexed_vote_counts(election_id, include_unconfirmed=False):
+    """
+    {candidate_uint (str): votes} for an election, from the index.
+
+    include_unconfirmed also counts the election's VoteCast events
+    between the index checkpoint and head. They are read for this
+    call only and never saved, so a reorg can't leave them counted.
+    """
+    election_uint = uuid_to_uint256(election_id)
+    tallies = get_vote_tallies(election_uint)
+
+    counts = {r["candidate_uint"]: r["votes"] for r in tallies}
+
+    if not include_unconfirmed or Config.BLOCKCHAIN_MODE != "WEB3":
+        return counts
+
+    w3 = get_web3()
+    from_block = _next_block(get_index_checkpoint(VOTE_CAST_STREAM))
+    head = w3.eth.block_number
+    if from_block > head:
+        return counts
+
+    # Tallies may already cover blocks past the checkpoint (crash
+    # between saving tallies and checkpoint); skip what they counted
+    last_blocks = {r["candidate_uint"]: r["last_block"] for r in tallies}
+
+    events = fetch_vote_cast_events(from_block, head, election_uint=election_uint, w3=w3)
+    for e in events:
+        candidate_uint = str(e["candidate_id"])
+        if e["block_number"] > last_blocks.get(candidate_uint, -1):
+            counts[candidate_uint] = counts.get(candidate_uint, 0) + 1
+
+    return counts
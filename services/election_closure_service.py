@@ -1,21 +1,45 @@
 from datetime import timedelta
-from models.representative import create_representative
-from services.result_service import get_constituency_results
+from models.representative import create_representative, get_rep_by_election_id_constituency_id
+from services.result_service import get_constituency_results, get_election_vote_counts
 from models.election import get_constituencies_for_election
 from utils.helpers import parse_iso_date
 import random
 from services.merkle_service import finalize_merkle_tree_for_election
 from services.representative_termination_service import completed_constituency_terms
+from services.representative_role_sync_service import sync_user_roles_for_users
+from services.chain_index_service import is_vote_index_current
+from services.vote_outbox_service import has_unsettled_votes
 
 
 def close_election_and_assign_reps(election):
     """
-    Called once when election ends.
+    Called when election ends, before it is marked COMPLETED.
     Assigns ELECTED_REP and OPPOSITION_REP for each constituency.
+
+    Safe to re-run after a failure: constituencies that already have
+    representatives from this election are skipped, and the Merkle
+    proofs resume from their checkpoint.
     """
 
     election_id = election["id"]
+
+    # ❗ Queued ballots would be missing from the tally
+    if has_unsettled_votes(election_id):
+        raise ValueError("Election has votes that are not on chain yet")
+
+    # ❗ Catching up is the indexer job's work, not this request's
+    if not is_vote_index_current():
+        raise ValueError("VoteCast index is behind the chain head")
+
     constituencies = get_constituencies_for_election(election_id)
+
+    # One tally for the whole election, shared by every constituency:
+    # the index plus the last few blocks, read without checkpointing
+    vote_counts = get_election_vote_counts(
+        election_id,
+        max_age=0,
+        include_unconfirmed=True
+    )
     print(constituencies)
 
     # Term dates
@@ -30,12 +54,17 @@ def close_election_and_assign_reps(election):
         # Get final vote counts
         results = get_constituency_results(
             election_id=election_id,
-            constituency_id=constituency_id
+            constituency_id=constituency_id,
+            vote_counts=vote_counts
         )
         print(results)
         if not results:
             continue
 
+        # Already assigned by an earlier, interrupted run
+        if get_rep_by_election_id_constituency_id(election_id, constituency_id):
+            continue
+
         # Sort by votes desc
         results.sort(key=lambda x: x["votes"], reverse=True)
 
@@ -88,4 +117,11 @@ def close_election_and_assign_reps(election):
                 party_name=runner_up["party_name"]
             )
 
+        # Roles switch over when the new term starts (daily sweep);
+        # this covers terms that already cover today
+        sync_user_roles_for_users([
+            winner["user_id"],
+            runner_up["user_id"] if runner_up else None
+        ])
+
     finalize_merkle_tree_for_election(election["id"])
@@ -1,13 +1,23 @@
 from datetime import datetime
 from services.election_closure_service import close_election_and_assign_reps
+from services.vote_outbox_service import has_unsettled_votes
+from services.chain_index_service import is_vote_index_current
 from utils.helpers import utc_now
+import threading
+
+# Elections being closed by this process (dashboard hits overlap)
+FINALIZING = set()
+FINALIZING_LOCK = threading.Lock()
 
 def finalize_election_if_needed(election):
     from models.election import get_election_by_id, mark_election_completed, parse_dt
     """
     Finalizes election ONLY ONCE:
-    - Marks election COMPLETED
-    - Assigns representatives
+    - Assigns representatives and publishes the Merkle root
+    - Marks election COMPLETED once both succeeded
+
+    A failed closure leaves the election open, so a later dashboard
+    hit retries it.
     """
     if election["status"] == "COMPLETED":
         return  # already done
@@ -23,8 +33,26 @@ def finalize_election_if_needed(election):
     if now <= end_dt_str:
         return
 
-    # 1️⃣ Mark election completed
-    mark_election_completed(election["id"])
+    # Wait for the vote outbox to drain; a later dashboard hit retries
+    if has_unsettled_votes(election["id"]):
+        return
+
+    # ... and for the indexer job to reach the chain head
+    if not is_vote_index_current():
+        return
+
+    with FINALIZING_LOCK:
+        if election["id"] in FINALIZING:
+            return
+        FINALIZING.add(election["id"])
+
+    try:
+        # 1️⃣ Tally, assign reps, publish root
+        close_election_and_assign_reps(election)
 
-    close_election_and_assign_reps(election)
+        # 2️⃣ Mark election completed
+        mark_election_completed(election["id"])
+    finally:
+        with FINALIZING_LOCK:
+            FINALIZING.discard(election["id"])
 
@@ -1,30 +1,504 @@
 # services/merkle_service.py
 
-from models.vote_receipt import get_receipts_by_election
-from models.vote_merkle_proof import store_merkle_proof
-from utils.merkle import get_merkle_root, get_merkle_proof,build_merkle_tree
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from models.vote_receipt import (
+    iter_receipt_hashes_by_election,
+    iter_receipt_hashes_by_constituency,
+    claim_receipt_leaf,
+    get_receipt_by_leaf_index
+)
+from models.vote_merkle_proof import (
+    store_merkle_proofs_bulk,
+    get_merkle_proof,
+    get_merkle_proofs
+)
+from models.election import get_election_status
+from models.merkle_accumulator import (
+    get_accumulator,
+    get_accumulators_by_election,
+    create_accumulator,
+    advance_accumulator
+)
+from utils.merkle import MerkleTree, accumulator_append, accumulator_root
+from utils.merkle_file import (
+    write_merkle_tree_file,
+    MerkleTreeFile,
+    write_shard_index_file,
+    ShardIndexFile
+)
 from services.blockchain_service import publish_merkle_root_on_chain
 
 
+MERKLE_PROOF_STORAGE = Config.MERKLE_PROOF_STORAGE
+
+# election_id -> (top MerkleTree or None, [MerkleTreeFile per shard],
+#                 ShardIndexFile or None)
+TREE_FILES = {}
+
+# One rebuild of missing tree files at a time per process
+TREE_REBUILD_LOCK = threading.Lock()
+
+
+# -------------------------------------------------
+# TREE LAYOUT
+# -------------------------------------------------
+# Each constituency is a shard with its own subtree, leaves ordered
+# by vote_receipts.leaf_index. The election root is the Merkle root
+# over the shard roots, ordered by constituency_id.
+#
+# Pairs are hashed sorted, so a receipt's proof is simply its shard
+# path followed by the top path of its shard, and verifies against
+# the election root like a flat proof.
+
 def finalize_merkle_tree_for_election(election_id):
     """
     Called ONCE after election ends.
     """
-    receipts = get_receipts_by_election(election_id)
+    shard_roots = get_shard_roots(election_id)
+
+    if not shard_roots:
+        # Election cast before per-constituency accumulators existed
+        return _finalize_flat_tree(election_id)
+
+    constituency_ids = sorted(shard_roots)
+    top = MerkleTree([shard_roots[c] for c in constituency_ids])
+    merkle_root = top.root
+
+    # 1️⃣ Root has been maintained while votes were cast
+    publish_merkle_root_on_chain(election_id, merkle_root)
+
+    # 2️⃣ Persist proofs
+    if MERKLE_PROOF_STORAGE == "FILE":
+        # Shards already closed via finalize_constituency_tree are skipped
+        with ThreadPoolExecutor(max_workers=Config.MERKLE_SHARD_WORKERS) as pool:
+            list(pool.map(
+                lambda c: finalize_constituency_tree(election_id, c),
+                constituency_ids
+            ))
+
+        _write_manifest(election_id, constituency_ids, shard_roots)
+        _forget_tree_files(election_id)
+
+    elif MERKLE_PROOF_STORAGE == "DB":
+        store_merkle_proofs_bulk(
+            election_id,
+            _iter_sharded_proofs(election_id, constituency_ids, top, shard_roots)
+        )
+
+    else:
+        raise Exception("Invalid MERKLE_PROOF_STORAGE configuration")
+
+    return merkle_root
+
+
+def finalize_constituency_tree(election_id, constituency_id):
+    """
+    Builds one constituency's subtree and writes its tree file.
+    Independent of every other constituency, so it can run as soon
+    as that constituency closes. Returns the shard root.
+    """
+    acc = _catch_up(election_id, constituency_id)
+    if acc["leaf_count"] == 0:
+        raise ValueError("No votes found for constituency")
+
+    expected_root = _accumulator_root_hex(acc)
+    path = _shard_file_path(election_id, constituency_id)
+
+    if os.path.exists(path):
+        existing = MerkleTreeFile(path)
+        try:
+            if existing.root == expected_root:
+                return expected_root
+        finally:
+            existing.close()
+
+    tree = _build_shard_tree(election_id, constituency_id)
+
+    if tree.root != expected_root:
+        raise ValueError("Stored receipts do not match the constituency Merkle root")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_merkle_tree_file(tree.levels, path)
+
+    return tree.root
+
+
+def _build_shard_tree(election_id, constituency_id):
+    receipt_hashes = list(
+        iter_receipt_hashes_by_constituency(election_id, constituency_id)
+    )
+
+    return MerkleTree(receipt_hashes, workers=Config.MERKLE_BUILD_WORKERS)
+
+
+def _iter_sharded_proofs(election_id, constituency_ids, top, shard_roots):
+    """
+    Yields (receipt_hash, proof) shard by shard, in a stable order,
+    holding only one shard tree in memory at a time.
+    """
+    for shard_no, constituency_id in enumerate(constituency_ids):
+        top_path = top.get_proof_by_index(shard_no)
+        tree = _build_shard_tree(election_id, constituency_id)
+
+        if tree.root != shard_roots[constituency_id]:
+            raise ValueError("Stored receipts do not match the constituency Merkle root")
+
+        for receipt_hash, proof in tree.iter_proofs():
+            yield receipt_hash, proof + top_path
+
 
-    if not receipts:
+def _finalize_flat_tree(election_id):
+    receipt_hashes = list(iter_receipt_hashes_by_election(election_id))
+
+    if not receipt_hashes:
         raise ValueError("No votes found for election")
 
-    receipt_hashes = [r["receipt_hash"] for r in receipts]
-    # 1️⃣ Compute root
-    merkle_root = get_merkle_root(receipt_hashes)
+    tree = MerkleTree(receipt_hashes, workers=Config.MERKLE_BUILD_WORKERS)
+    merkle_root = tree.root
+
+    if MERKLE_PROOF_STORAGE == "FILE":
+        _write_flat_tree_file(election_id, tree)
+        _forget_tree_files(election_id)
+
+    elif MERKLE_PROOF_STORAGE == "DB":
+        store_merkle_proofs_bulk(election_id, tree.iter_proofs())
 
-    # 2️⃣ Store proof for each receipt
-    for r in receipt_hashes:
-        proof = get_merkle_proof(receipt_hashes, r)
-        store_merkle_proof(election_id, r, proof)
+    else:
+        raise Exception("Invalid MERKLE_PROOF_STORAGE configuration")
 
-    # 3️⃣ Publish root on-chain
     publish_merkle_root_on_chain(election_id, merkle_root)
 
     return merkle_root
+
+
+def _write_flat_tree_file(election_id, tree):
+    os.makedirs(Config.MERKLE_TREE_DIR, exist_ok=True)
+    write_merkle_tree_file(tree.levels, _flat_file_path(election_id))
+
+
+def _rebuild_tree_files(election_id):
+    """
+    FILE storage: tree files live on the host that finalized the
+    election, so they are missing after a redeploy and on every other
+    host. A completed election's files are rebuilt here from its
+    stored receipts (the root is already on chain and not published
+    again). Returns the loaded entry, or None.
+    """
+    try:
+        _election_dir(election_id)
+    except ValueError:
+        return None
+
+    if get_election_status(election_id) != "COMPLETED":
+        return None
+
+    with TREE_REBUILD_LOCK:
+        # Another request may have rebuilt them meanwhile
+        entry = _load_tree_files(election_id)
+        if entry:
+            return entry
+
+        shard_roots = get_shard_roots(election_id)
+
+        if shard_roots:
+            constituency_ids = sorted(shard_roots)
+            for constituency_id in constituency_ids:
+                finalize_constituency_tree(election_id, constituency_id)
+            _write_manifest(election_id, constituency_ids, shard_roots)
+
+        else:
+            receipt_hashes = list(iter_receipt_hashes_by_election(election_id))
+            if not receipt_hashes:
+                return None
+
+            _write_flat_tree_file(
+                election_id,
+                MerkleTree(receipt_hashes, workers=Config.MERKLE_BUILD_WORKERS)
+            )
+
+        return _load_tree_files(election_id)
+
+
+# -------------------------------------------------
+# INCREMENTAL ACCUMULATOR
+# -------------------------------------------------
+# vote_receipts.leaf_index is the source of truth for leaf order.
+# merkle_accumulators caches the frontier of leaves [0, leaf_count)
+# per constituency and is advanced with compare-and-set, so any
+# worker can fold in a receipt that another worker stored but did
+# not get to apply.
+
+def _load_accumulator(election_id, constituency_id):
+    acc = get_accumulator(election_id, constituency_id)
+    if not acc:
+        create_accumulator(election_id, constituency_id)
+        acc = get_accumulator(election_id, constituency_id)
+    return acc
+
+
+def _accumulator_root_hex(acc):
+    frontier = [bytes.fromhex(h) if h else None for h in acc["frontier"]]
+    return accumulator_root(frontier, acc["leaf_count"]).hex()
+
+
+def _fold_receipt(acc, receipt_hash):
+    frontier = [bytes.fromhex(h) if h else None for h in acc["frontier"]]
+    frontier = accumulator_append(
+        frontier,
+        acc["leaf_count"],
+        bytes.fromhex(receipt_hash)
+    )
+
+    # Losing the CAS means another worker already folded this leaf
+    advance_accumulator(
+        acc["election_id"],
+        acc["constituency_id"],
+        acc["leaf_count"],
+        [node.hex() if node else None for node in frontier]
+    )
+
+
+def _catch_up(election_id, constituency_id, acc=None):
+    """
+    Folds in receipts stored past the accumulator's leaf_count.
+    """
+    acc = acc or _load_accumulator(election_id, constituency_id)
+
+    while True:
+        receipt = get_receipt_by_leaf_index(
+            election_id, constituency_id, acc["leaf_count"]
+        )
+        if not receipt:
+            return acc
+
+        _fold_receipt(acc, receipt["receipt_hash"])
+        acc = get_accumulator(election_id, constituency_id)
+
+
+def append_receipt(election_id, constituency_id, receipt_hash):
+    """
+    Stores a receipt at the next leaf of its constituency subtree
+    and updates that subtree's accumulator in O(log n).
+
+    Returns the receipt's leaf index.
+    """
+    while True:
+        acc = _load_accumulator(election_id, constituency_id)
+        leaf_index = acc["leaf_count"]
+
+        if claim_receipt_leaf(election_id, constituency_id, receipt_hash, leaf_index):
+            _fold_receipt(acc, receipt_hash)
+            return leaf_index
+
+        # Position taken by a concurrent vote → help it along, retry
+        _catch_up(election_id, constituency_id)
+
+
+def get_shard_roots(election_id):
+    """
+    {constituency_id: subtree root hex} for every constituency
+    that has received votes.
+    """
+    shard_roots = {}
+
+    for acc in get_accumulators_by_election(election_id):
+        acc = _catch_up(election_id, acc["constituency_id"], acc)
+        if acc["leaf_count"]:
+            shard_roots[acc["constituency_id"]] = _accumulator_root_hex(acc)
+
+    return shard_roots
+
+
+def get_current_merkle_root(election_id):
+    """
+    Election Merkle root over every receipt cast so far, or None.
+    """
+    shard_roots = get_shard_roots(election_id)
+
+    if not shard_roots:
+        return None
+
+    return MerkleTree([shard_roots[c] for c in sorted(shard_roots)]).root
+
+
+# -------------------------------------------------
+# PROOF LOOKUP
+# -------------------------------------------------
+
+def _election_dir(election_id):
+    # election_id comes from public requests → only accept UUIDs
+    return os.path.join(Config.MERKLE_TREE_DIR, str(uuid.UUID(str(election_id))))
+
+
+def _flat_file_path(election_id):
+    return f"{_election_dir(election_id)}.mtree"
+
+
+def _shard_file_path(election_id, constituency_id):
+    return os.path.join(
+        _election_dir(election_id),
+        f"{uuid.UUID(str(constituency_id))}.mtree"
+    )
+
+
+def _manifest_path(election_id):
+    return os.path.join(_election_dir(election_id), "manifest.json")
+
+
+def _shard_index_path(election_id):
+    return os.path.join(_election_dir(election_id), "receipts.idx")
+
+
+def _write_shard_index(election_id, constituency_ids):
+    shards = [
+        MerkleTreeFile(_shard_file_path(election_id, c))
+        for c in constituency_ids
+    ]
+    try:
+        write_shard_index_file(shards, _shard_index_path(election_id))
+    finally:
+        for shard in shards:
+            shard.close()
+
+
+def _write_manifest(election_id, constituency_ids, shard_roots):
+    """
+    Written last: proofs are only served once every shard and the
+    receipt → shard index are on disk.
+    """
+    _write_shard_index(election_id, constituency_ids)
+
+    path = _manifest_path(election_id)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "constituency_ids": constituency_ids,
+            "roots": [shard_roots[c] for c in constituency_ids]
+        }, f)
+
+    os.replace(tmp_path, path)
+
+
+def _forget_tree_files(election_id):
+    entry = TREE_FILES.pop(election_id, None)
+    if entry:
+        for tree_file in entry[1]:
+            tree_file.close()
+        if entry[2]:
+            entry[2].close()
+
+
+def _load_tree_files(election_id):
+    """
+    Returns (top tree or None, shard files, shard index or None)
+    for an election, or None if it was not finalized to files.
+    """
+    entry = TREE_FILES.get(election_id)
+    if entry:
+        return entry
+
+    try:
+        manifest_path = _manifest_path(election_id)
+        flat_path = _flat_file_path(election_id)
+    except ValueError:
+        return None
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        # Elections finalized before the index existed get it now
+        if not os.path.exists(_shard_index_path(election_id)):
+            _write_shard_index(election_id, manifest["constituency_ids"])
+
+        top = MerkleTree(manifest["roots"])
+        shards = [
+            MerkleTreeFile(_shard_file_path(election_id, c))
+            for c in manifest["constituency_ids"]
+        ]
+        entry = (top, shards, ShardIndexFile(_shard_index_path(election_id)))
+
+    elif os.path.exists(flat_path):
+        entry = (None, [MerkleTreeFile(flat_path)], None)
+
+    else:
+        return None
+
+    TREE_FILES[election_id] = entry
+    return entry
+
+
+def _tree_files_for_lookup(election_id):
+    entry = _load_tree_files(election_id)
+
+    if entry is None and MERKLE_PROOF_STORAGE == "FILE":
+        entry = _rebuild_tree_files(election_id)
+
+    return entry
+
+
+def get_receipt_proof(election_id, receipt_hash):
+    """
+    Returns the Merkle proof (list of hex siblings) for a receipt,
+    or None if the receipt is not part of the election.
+
+    Served from tree files when present (FILE storage rebuilds
+    missing ones); elections finalized into vote_merkle_proofs rows
+    fall back to a DB lookup.
+    """
+    entry = _tree_files_for_lookup(election_id)
+
+    if entry is None:
+        record = get_merkle_proof(election_id, receipt_hash)
+        return record["proof"] if record else None
+
+    return _proof_from_files(entry, receipt_hash)
+
+
+def get_receipt_proofs(election_id, receipt_hashes):
+    """
+    Batch version of get_receipt_proof().
+    Returns {receipt_hash: proof} for receipts found in the election;
+    DB-backed elections are served with chunked IN queries.
+    """
+    entry = _tree_files_for_lookup(election_id)
+
+    if entry is None:
+        return get_merkle_proofs(election_id, receipt_hashes)
+
+    proofs = {}
+    for receipt_hash in receipt_hashes:
+        proof = _proof_from_files(entry, receipt_hash)
+        if proof is not None:
+            proofs[receipt_hash] = proof
+
+    return proofs
+
+
+def _proof_from_files(entry, receipt_hash):
+    """
+    O(log n): one binary search in the receipt → shard index, one
+    in that shard's receipt index, then the proof path.
+    """
+    top, shards, shard_index = entry
+
+    shard_no = shard_index.find_shard(receipt_hash) if shard_index else 0
+    if shard_no is None:
+        return None
+
+    shard = shards[shard_no]
+    index = shard.find_leaf_index(receipt_hash)
+    if index is None:
+        return None
+
+    proof = shard.get_proof_by_index(index)
+    if top:
+        proof += top.get_proof_by_index(shard_no)
+    return proof
@@ -0,0 +1,192 @@
+# services/nonce_manager.py
+
+import fcntl
+import os
+import time
+from contextlib import contextmanager
+
+from config import Config
+
+
+# -------------------------------------------------
+# LOCAL NONCE ALLOCATION
+# -------------------------------------------------
+# Nonces for a signing address are handed out locally instead of
+# asking the node for every transaction. The next free nonce lives in
+# a small file per address under NONCE_STATE_DIR and is only read and
+# advanced under an exclusive flock, so gunicorn workers (and threads)
+# on one host never sign two transactions with the same nonce.
+#
+# Each process syncs from the node's pending count on first use, and
+# the counter never moves below nonces other workers already hold.
+# The nonce of a send that failed is given back: it is handed out
+# again before any new nonce, so it doesn't leave a gap that would
+# stall every later transaction of the address.
+#
+# Gaps the process can't see (a crash between allocation and
+# broadcast, a transaction the node dropped) are found by re-reading
+# the pending count every NONCE_CHECK_SECONDS: if it stays at the same
+# value below the counter for NONCE_GAP_SECONDS, that nonce is never
+# coming and the counter restarts from the pending count.
+
+NONCE_SYNCED = set()  # addresses this process has synced
+
+NONCE_ERRORS = (
+    "nonce too low",
+    "replacement transaction underpriced",
+)
+
+
+def _state_path(address):
+    return os.path.join(Config.NONCE_STATE_DIR, f"{address.lower()}.nonce")
+
+
+@contextmanager
+def _locked_nonce(address):
+    """
+    Yields {"next": int | None, "free": [int], "checked_at": float,
+    "stall": (pending, since) | None} under the address lock and
+    writes it back on exit.
+
+    File: next nonce on the first line, given-back nonces
+    (comma separated) on the second, time of the last pending count
+    check on the third, "pending,since" of a suspected gap on the
+    fourth.
+    """
+    os.makedirs(Config.NONCE_STATE_DIR, exist_ok=True)
+
+    with open(_state_path(address), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            lines = f.read().split("\n") + ["", "", ""]
+            stall = lines[3].strip()
+            state = {
+                "next": int(lines[0]) if lines[0].strip() else None,
+                "free": [int(n) for n in lines[1].split(",") if n.strip()],
+                "checked_at": float(lines[2]) if lines[2].strip() else 0.0,
+                "stall": (
+                    (int(stall.split(",")[0]), float(stall.split(",")[1]))
+                    if stall else None
+                )
+            }
+
+            yield state
+
+            f.seek(0)
+            f.truncate()
+            f.write("\n".join([
+                str(state["next"]),
+                ",".join(map(str, sorted(state["free"]))),
+                str(state["checked_at"]),
+                ",".join(map(str, state["stall"])) if state["stall"] else ""
+            ]))
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _pending_count(w3, address):
+    return w3.eth.get_transaction_count(address, "pending")
+
+
+def _sync(state, pending):
+    # Never go below nonces other workers already handed out; nonces
+    # below the node's pending count are used, so they aren't free
+    state["next"] = max(state["next"] or 0, pending)
+    state["free"] = [n for n in state["free"] if n >= pending]
+
+    now = time.time()
+    state["checked_at"] = now
+
+    if pending >= state["next"]:
+        state["stall"] = None
+
+    # Nonces were handed out above `pending`; note when it was first
+    # seen stuck there (a nonce in flight reaches the node in seconds)
+    elif not state["stall"] or state["stall"][0] != pending:
+        state["stall"] = (pending, now)
+
+    # Stuck for NONCE_GAP_SECONDS: nonce `pending` was never broadcast
+    # or was dropped, and everything above it waits behind it
+    elif now - state["stall"][1] >= Config.NONCE_GAP_SECONDS:
+        print(f"⚠️ Nonce {pending} never reached the node: counter {state['next']} → {pending}")
+        state["next"] = pending
+        state["free"] = []
+        state["stall"] = None
+
+
+def allocate_nonce(w3, address):
+    """
+    Next nonce for `address`, unique across workers on this host.
+    """
+    with _locked_nonce(address) as state:
+        stale = time.time() - state["checked_at"] >= Config.NONCE_CHECK_SECONDS
+
+        if state["next"] is None or address not in NONCE_SYNCED or stale:
+            # Never go below nonces other workers already handed out
+            _sync(state, _pending_count(w3, address))
+            NONCE_SYNCED.add(address)
+
+        # Given-back nonces first, lowest first
+        if state["free"]:
+            nonce = min(state["free"])
+            state["free"].remove(nonce)
+        else:
+            nonce = state["next"]
+            state["next"] += 1
+
+    return nonce
+
+
+def resync_nonce(w3, address):
+    """
+    Moves the local counter up to the node's pending count
+    (never down: lower nonces may be in flight in other workers).
+    """
+    with _locked_nonce(address) as state:
+        _sync(state, _pending_count(w3, address))
+        NONCE_SYNCED.add(address)
+
+
+def release_nonce(address, nonce):
+    """
+    Gives back the nonce of a send that failed. If it is still the
+    last one handed out the counter moves back; otherwise it is kept
+    for the next allocation, so no gap is left.
+    """
+    with _locked_nonce(address) as state:
+        if state["next"] == nonce + 1:
+            state["next"] = nonce
+        elif nonce < state["next"] and nonce not in state["free"]:
+            state["free"].append(nonce)
+
+
+def is_nonce_error(exc):
+    message = str(exc).lower()
+    return any(err in message for err in NONCE_ERRORS)
+
+
+def send_with_nonce(w3, address, sign_and_send):
+    """
+    Allocates a nonce and calls sign_and_send(nonce) -> tx hash.
+
+    Nonce errors re-sync the counter from the node and are retried
+    with a fresh nonce up to NONCE_RETRIES times; any other failure
+    gives the nonce back (see release_nonce) and is raised.
+    """
+    attempt = 0
+    while True:
+        nonce = allocate_nonce(w3, address)
+        try:
+            return sign_and_send(nonce)
+        except Exception as e:
+            if not is_nonce_error(e):
+                release_nonce(address, nonce)
+                raise
+
+            resync_nonce(w3, address)
+
+            attempt += 1
+            if attempt > Config.NONCE_RETRIES:
+                raise
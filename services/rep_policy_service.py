@@ -8,6 +8,7 @@ from models.rep_policy import (
     upsert_vote
 )
 from models.audit import create_audit_log
+from models.rep_policy_comments import count_policy_comments
 from services.policy_ai_service import (
     should_run_ai,
     store_ai_analysis
@@ -20,7 +21,7 @@ import cloudinary.uploader
 from utils.helpers import utc_now
 from models.rep_policy import update_policy_post_images
 from models.rep_policy import get_user_vote, upsert_vote, remove_vote
-from supabase_db.db import fetch_one, fetch_all, insert_record, update_record
+from supabase_db.db import fetch_one, insert_record, update_record
 
 
 # -------------------------------------------------
@@ -160,6 +161,8 @@ def vote_policy_post(user_id, post_id, vote_value):
 def get_policy_feed(constituency_id):
     posts = get_policy_posts_by_constituency(constituency_id)
 
+    comment_counts = count_policy_comments([p["id"] for p in posts])
+
     enriched = []
 
     for p in posts:
@@ -174,8 +177,7 @@ def get_policy_feed(constituency_id):
         p["score"] = p["upvotes"] - p["downvotes"]
 
         # comment count
-        comments = fetch_all("rep_policy_comments", {"post_id": p["id"]}) or []
-        p["comment_count"] = len(comments)
+        p["comment_count"] = comment_counts[p["id"]]
 
         enriched.append(p)
 
@@ -188,6 +190,8 @@ def get_policy_feed(constituency_id):
 def get_policy_posts_by_user_id(user_id):
     posts = get_policy_posts_by_user(user_id)
 
+    comment_counts = count_policy_comments([p["id"] for p in posts])
+
     enriched = []
 
     for p in posts:
@@ -202,8 +206,7 @@ def get_policy_posts_by_user_id(user_id):
         p["score"] = p["upvotes"] - p["downvotes"]
 
         # comment count
-        comments = fetch_all("rep_policy_comments", {"post_id": p["id"]}) or []
-        p["comment_count"] = len(comments)
+        p["comment_count"] = comment_counts[p["id"]]
 
         enriched.append(p)
 
@@ -302,13 +305,13 @@ def add_counter_statement(post_id, user_id, role, content, images=None):
             )
 
 def get_policy_feed_for_rep(constituency_id, rep_user_id):
-    posts = get_policy_posts_by_constituency(constituency_id)
+    # 🔴 Only that representative's posts (filtered by Postgres)
+    posts = get_policy_posts_by_constituency(
+        constituency_id,
+        created_by_user_id=rep_user_id
+    )
 
-    # 🔴 Filter posts of only that representative
-    posts = [
-        p for p in posts
-        if p.get("created_by_user_id") == rep_user_id
-    ]
+    comment_counts = count_policy_comments([p["id"] for p in posts])
 
     enriched = []
 
@@ -328,8 +331,7 @@ def get_policy_feed_for_rep(constituency_id, rep_user_id):
         p["time_ago"] = _time_ago(p.get("created_at"))
         p["score"] = p["upvotes"] - p["downvotes"]
 
-        comments = fetch_all("rep_policy_comments", {"post_id": p["id"]}) or []
-        p["comment_count"] = len(comments)
+        p["comment_count"] = comment_counts[p["id"]]
 
         enriched.append(p)
 
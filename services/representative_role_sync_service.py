@@ -1,48 +1,108 @@
+from collections import defaultdict
 from utils.helpers import today_ist
 from models.representative import (
-    get_active_representatives,
-    get_all_representatives,
-    get_terminated_representatives
+    iter_representative_terms,
+    get_representatives_by_user
 )
-from models.user import update_user_role
-from utils.helpers import utc_now
+from models.user import get_user_roles, set_user_roles
 
 
-def sync_user_roles_from_representatives():
+# -----------------------------
+# Role Rules
+# -----------------------------
+# A user with representative rows gets:
+# - CITIZEN if any of their terms was TERMINATED
+# - otherwise the type of a term covering today (ELECTED_REP / OPPOSITION_REP)
+# - otherwise CITIZEN (term expired or not started)
+
+def _target_roles(reps, today):
     """
-    Synchronizes user roles based on representative status.
-    SAFE to run multiple times.
+    {user_id: role} for every user appearing in reps.
     """
+    today = today.isoformat()
 
-    today = today_ist()
+    active_roles = {}
+    terminated_users = set()
+    all_users = set()
 
-    # 1️⃣ Active representatives
-    active_reps = get_active_representatives(today)
-    active_user_roles = {}
+    for rep in reps:
+        user_id = rep.get("user_id")
+        if not user_id:
+            continue
 
-    for rep in active_reps:
-        if rep.get("user_id"):
-            active_user_roles[rep["user_id"]] = rep["type"]
+        all_users.add(user_id)
 
-    # Assign roles to active reps
-    for user_id, role in active_user_roles.items():
-        update_user_role(user_id, role)
+        if rep["term_start"] <= today <= rep["term_end"]:
+            active_roles[user_id] = rep["type"]
 
-    # 2️⃣ Explicitly downgrade TERMINATED reps
-    terminated_reps = get_terminated_representatives(utc_now().date())
+        if rep.get("status") == "TERMINATED":
+            terminated_users.add(user_id)
+
+    return {
+        user_id: (
+            "CITIZEN" if user_id in terminated_users
+            else active_roles.get(user_id, "CITIZEN")
+        )
+        for user_id in all_users
+    }
 
-    for rep in terminated_reps:
-        if rep.get("user_id"):
-            update_user_role(rep["user_id"], "CITIZEN")
 
-    # 3️⃣ Handle expired terms (not active anymore but not terminated)
-    all_reps = get_all_representatives()
+def _apply_roles(target_roles):
+    """
+    Reconciles stored roles with target_roles:
+    - current roles are read in one projected query
+    - only users whose role differs are written
+    - one IN-list UPDATE per target role
 
-    all_rep_users = {
-        r["user_id"] for r in all_reps if r.get("user_id")
+    Returns a report of what was touched.
+    """
+    current_roles = get_user_roles(target_roles.keys())
+
+    # role -> [user ids to move to that role]
+    changes = defaultdict(list)
+    for user_id, role in target_roles.items():
+        if user_id in current_roles and current_roles[user_id] != role:
+            changes[role].append(user_id)
+
+    updated_by_role = {
+        role: set_user_roles(user_ids, role)
+        for role, user_ids in changes.items()
     }
 
-    expired_users = all_rep_users - set(active_user_roles.keys())
+    return {
+        "users_checked": len(current_roles),
+        "rows_updated": sum(updated_by_role.values()),
+        "updated_by_role": updated_by_role
+    }
+
+
+# -----------------------------
+# Change-driven Sync
+# -----------------------------
 
-    for user_id in expired_users:
-        update_user_role(user_id, "CITIZEN")
\ No newline at end of file
+def sync_user_roles_for_users(user_ids):
+    """
+    Re-derives the roles of specific users after a representative
+    lifecycle change (created, terminated, completed).
+    """
+    reps = []
+    for user_id in set(u for u in user_ids if u):
+        reps.extend(get_representatives_by_user(user_id))
+
+    return _apply_roles(_target_roles(reps, today_ist()))
+
+
+# -----------------------------
+# Scheduled Sweep
+# -----------------------------
+
+def sync_user_roles_from_representatives():
+    """
+    Synchronizes user roles based on representative status.
+    SAFE to run multiple times.
+
+    Run on a schedule (jobs/role_sync_job) to pick up terms that
+    started or expired with the date; lifecycle changes call
+    sync_user_roles_for_users() directly.
+    """
+    return _apply_roles(_target_roles(iter_representative_terms(), today_ist()))
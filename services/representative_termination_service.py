@@ -4,15 +4,17 @@ from models.representative import (
     update_record
 )
 from utils.helpers import utc_now
-from services.representative_role_sync_service import sync_user_roles_from_representatives
+from services.representative_role_sync_service import sync_user_roles_for_users
 from models.notification import create_notification
 from models.constituency import get_constituency_by_id,get_state_id_by_constituency_id
 
 def terminate_constituency_terms(constituency_id: str):
     reps = get_representatives_by_constituency(constituency_id)
+    changed_users = []
 
     for r in reps:
         if r.get("status") == "ACTIVE":
+            changed_users.append(r.get("user_id"))
             update_record(
                 REPRESENTATIVES_TABLE,
                 {"id": r["id"]},
@@ -24,7 +26,7 @@ def terminate_constituency_terms(constituency_id: str):
                 },
                 use_admin=True
             )
-    sync_user_roles_from_representatives()
+    sync_user_roles_for_users(changed_users)
     constituency = get_constituency_by_id(constituency_id)
     state_id = get_state_id_by_constituency_id(constituency_id)
 
@@ -38,9 +40,11 @@ def terminate_constituency_terms(constituency_id: str):
 
 def completed_constituency_terms(constituency_id: str):
     reps = get_representatives_by_constituency(constituency_id)
+    changed_users = []
 
     for r in reps:
         if r.get("status") == "ACTIVE":
+            changed_users.append(r.get("user_id"))
             update_record(
                 REPRESENTATIVES_TABLE,
                 {"id": r["id"]},
@@ -50,4 +54,4 @@ def completed_constituency_terms(constituency_id: str):
                 },
                 use_admin=True
             )
-    sync_user_roles_from_representatives()
\ No newline at end of file
+    sync_user_roles_for_users(changed_users)
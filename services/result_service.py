@@ -1,16 +1,78 @@
-from utils.crypto import uuid_to_uint256
-from services.blockchain_reader import get_votes_from_chain
-from models.candidate import get_candidates_by_election_and_constituency, get_user_id_by_candidate_id 
+from utils.crypto import candidate_uint_to_id
+from services.chain_index_service import get_indexed_vote_counts
+from models.candidate import (
+    get_candidates_by_election_and_constituency,
+    load_candidate_chain_ids
+)
 import random
+import time
+from config import Config
 from models.election import get_election_by_id
 from utils.helpers import utc_now
 
-def get_final_constituency_results(election_id, constituency_id):
+
+# (election_id, include_unconfirmed) -> (vote_counts, fetched_at)
+ELECTION_VOTE_COUNTS = {}
+
+# election_id -> chain ids still unknown after load_candidate_chain_ids
+UNKNOWN_CHAIN_IDS = {}
+
+
+def get_election_vote_counts(election_id, max_age=None, include_unconfirmed=False):
+    """
+    {candidate_id: votes} for the WHOLE election.
+
+    Read once and shared by every constituency of the election;
+    reused for up to RESULTS_CACHE_TTL seconds (or max_age).
+    include_unconfirmed adds votes not yet past the index's
+    confirmation depth (see get_indexed_vote_counts).
+    Chain ids are resolved through the candidate ID codec;
+    ids that are not candidates of the election are dropped.
+    """
+    if max_age is None:
+        max_age = Config.RESULTS_CACHE_TTL
+
+    # Confirmed-only and unconfirmed tallies are never served for each other
+    key = (election_id, include_unconfirmed)
+
+    cached = ELECTION_VOTE_COUNTS.get(key)
+    if cached and time.monotonic() - cached[1] < max_age:
+        return cached[0]
+
+    chain_counts = get_indexed_vote_counts(election_id, include_unconfirmed)
+
+    unresolved = {
+        cid for cid in chain_counts
+        if candidate_uint_to_id(cid) is None
+    }
+
+    # Reload candidates only for chain ids not seen before; ids that
+    # are no candidate of the election stay unknown
+    if unresolved - UNKNOWN_CHAIN_IDS.get(election_id, set()):
+        load_candidate_chain_ids(election_id)
+        UNKNOWN_CHAIN_IDS[election_id] = {
+            cid for cid in unresolved
+            if candidate_uint_to_id(cid) is None
+        }
+
+    vote_counts = {}
+    for cid, votes in chain_counts.items():
+        candidate_id = candidate_uint_to_id(cid)
+        if candidate_id:
+            vote_counts[candidate_id] = votes
+
+    ELECTION_VOTE_COUNTS[key] = (vote_counts, time.monotonic())
+
+    return vote_counts
+
+def get_final_constituency_results(election_id, constituency_id, vote_counts=None):
     """
     Returns:
     - winner
     - runner_up
     - all candidates with vote counts
+
+    vote_counts: election-wide tally, see get_election_vote_counts()
     """
 
     election = get_election_by_id(election_id)
@@ -27,24 +89,22 @@ def get_final_constituency_results(election_id, constituency_id):
         constituency_id=constituency_id
     )
 
-    # 2️⃣ Prepare candidate map (uint256 id)
+    # 2️⃣ Prepare candidate map
     candidate_map = {}
     for c in candidates:
-        cid_uint = str(uuid_to_uint256(c["id"]))
-        candidate_map[cid_uint] = {
+        candidate_map[c["id"]] = {
             "candidate_id": c["id"],
             "candidate_name": c["candidate_name"],
             "party_name": c["party_name"],
             "votes": 0
         }
 
-    # 3️⃣ Count votes from blockchain
-    votes = get_votes_from_chain(election_id)
+    # 3️⃣ Vote counts from the election-wide tally
+    if vote_counts is None:
+        vote_counts = get_election_vote_counts(election_id)
 
-    for v in votes:
-        cid = str(v["candidate_id"])
-        if cid in candidate_map:
-            candidate_map[cid]["votes"] += 1
+    for cid, entry in candidate_map.items():
+        entry["votes"] = vote_counts.get(cid, 0)
 
     results = list(candidate_map.values())
 
@@ -77,7 +137,12 @@ def get_final_constituency_results(election_id, constituency_id):
     }
 
 
-def get_constituency_results(election_id, constituency_id):
+def get_constituency_results(election_id, constituency_id, vote_counts=None):
+    """
+    Candidates of one constituency with their vote counts.
+
+    vote_counts: election-wide tally, see get_election_vote_counts()
+    """
 
     candidates = get_candidates_by_election_and_constituency(
         election_id=election_id,
@@ -86,27 +151,21 @@ def get_constituency_results(election_id, constituency_id):
 
     candidate_map = {}
 
-    # 🔑 IMPORTANT: map using uint256(candidate_id)
     for c in candidates:
-        candidate_uint = str(uuid_to_uint256(c["id"]))
-        user_id = get_user_id_by_candidate_id(c["id"])
-
-        candidate_map[candidate_uint] = {
+        candidate_map[c["id"]] = {
             "candidate_id": c["id"], 
-            "user_id": user_id,      
+            "user_id": c["user_id"],      
             "candidate_name": c["candidate_name"],
             "party_name": c["party_name"],
             "votes": 0
         }
 
-    # Read blockchain events
-    votes = get_votes_from_chain(election_id)
-
-    for v in votes:
-        cid = str(v["candidate_id"])  # uint256 from chain
+    # Vote counts from the election-wide tally
+    if vote_counts is None:
+        vote_counts = get_election_vote_counts(election_id)
 
-        if cid in candidate_map:
-            candidate_map[cid]["votes"] += 1
+    for cid, entry in candidate_map.items():
+        entry["votes"] = vote_counts.get(cid, 0)
 
     return list(candidate_map.values())
 
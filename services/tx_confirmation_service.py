@@ -0,0 +1,87 @@
+# services/tx_confirmation_service.py
+
+from collections import defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from config import Config
+from models.ledger import (
+    iter_ledger_entries_by_status,
+    update_ledger_status,
+    count_ledger_entries_by_status
+)
+from models.vote import set_vote_block_numbers
+from models.vote_outbox import PENDING, SENDING, SUBMITTED, count_outbox_entries
+from services.blockchain_service import get_transaction_receipts, get_transaction_status
+from utils.helpers import utc_now
+
+
+# -------------------------------------------------
+# CONFIRMATION TRACKER
+# -------------------------------------------------
+# Ledger entries written with status PENDING are on-chain transactions
+# waiting to be mined. Each run looks up their receipts in JSON-RPC
+# batches and writes the outcome back with one UPDATE per
+# (status, block): CONFIRMED / REVERTED with block_number, or DROPPED
+# once the node has forgotten an unmined transaction.
+
+def track_confirmations():
+    """
+    Returns {status: transactions updated} for this run.
+    """
+    entries = list(islice(
+        iter_ledger_entries_by_status("PENDING", Config.TX_CONFIRM_SCAN_LIMIT),
+        Config.TX_CONFIRM_SCAN_LIMIT
+    ))
+    if not entries:
+        return {}
+
+    tx_hashes = list(dict.fromkeys(e["transaction_hash"] for e in entries))
+    receipts = get_transaction_receipts(tx_hashes)
+
+    # (status, block_number) -> [tx hashes]
+    outcomes = defaultdict(list)
+    for tx_hash, outcome in receipts.items():
+        outcomes[outcome].append(tx_hash)
+
+    # Unmined and old: dropped if the node no longer knows it
+    stale_before = (
+        utc_now() - timedelta(seconds=Config.OUTBOX_STALE_SECONDS)
+    ).isoformat()
+
+    for entry in entries:
+        tx_hash = entry["transaction_hash"]
+        if tx_hash in receipts or entry["timestamp"] >= stale_before:
+            continue
+
+        if get_transaction_status(tx_hash)[0] == "UNKNOWN":
+            outcomes[("DROPPED", None)].append(tx_hash)
+
+    updated = defaultdict(int)
+
+    for (status, block_number), hashes in outcomes.items():
+        update_ledger_status(hashes, status, block_number)
+
+        if status == "CONFIRMED" and block_number is not None:
+            set_vote_block_numbers(hashes, block_number)
+
+        updated[status] += len(hashes)
+
+    return dict(updated)
+
+
+def get_confirmation_backlog():
+    """
+    Election-day health: transactions awaiting confirmation and
+    votes still in the outbox.
+    """
+    oldest = next(iter_ledger_entries_by_status("PENDING", page_size=1), None)
+
+    return {
+        "pending_transactions": count_ledger_entries_by_status("PENDING"),
+        "oldest_pending_at": oldest["timestamp"] if oldest else None,
+        "outbox": {
+            status: count_outbox_entries(status)
+            for status in (PENDING, SENDING, SUBMITTED)
+        }
+    }
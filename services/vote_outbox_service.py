@@ -0,0 +1,242 @@
+# services/vote_outbox_service.py
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+
+from config import Config
+from models.vote_outbox import (
+    PENDING,
+    SENDING,
+    SUBMITTED,
+    enqueue_vote,
+    iter_outbox_entries,
+    count_unsettled_entries,
+    claim_outbox_entries,
+    set_batch_tx_hash,
+    mark_batch_submitted,
+    mark_batch_confirmed,
+    mark_batch_failed,
+    requeue_batch
+)
+from models.ledger import create_ledger_entry
+from services.blockchain_service import (
+    cast_votes_on_chain,
+    get_transaction_status,
+    get_transaction_receipts
+)
+from utils.helpers import generate_uuid, utc_now
+
+
+# -------------------------------------------------
+# VOTE OUTBOX
+# -------------------------------------------------
+# Ballots are committed to vote_outbox inside the request and cast on
+# chain later by the dispatcher (jobs/vote_outbox_job), so the booth
+# never waits on the RPC node. Entries are claimed with compare-and-
+# set, so several dispatchers can run at once, and nothing leaves the
+# outbox before its transaction is mined successfully.
+#
+# Votes of one election are sent in castVotes batches: a batch goes
+# out once it is full (VOTE_BATCH_SIZE) or its oldest vote has waited
+# VOTE_BATCH_MAX_WAIT_MS.
+
+def queue_vote(election_id, candidate_id):
+    return enqueue_vote(election_id, candidate_id)
+
+
+def has_unsettled_votes(election_id):
+    """
+    True while any vote of the election is still queued, being sent
+    or waiting to be mined. Results must not be tallied before then.
+    """
+    return count_unsettled_entries(election_id) > 0
+
+
+def _seconds_ago(seconds):
+    return (utc_now() - timedelta(seconds=seconds)).isoformat()
+
+
+def _retry_at(attempts):
+    delay = min(Config.OUTBOX_MAX_BACKOFF, 2 ** attempts)
+    return (utc_now() + timedelta(seconds=delay)).isoformat()
+
+
+def _due_entries(status, is_due):
+    entries = (
+        e for e in iter_outbox_entries(status, Config.OUTBOX_BATCH_SIZE)
+        if is_due(e)
+    )
+    return list(islice(entries, Config.OUTBOX_BATCH_SIZE))
+
+
+def _by_batch(entries):
+    batches = defaultdict(list)
+    for entry in entries:
+        batches[entry["batch_id"]].append(entry)
+    return batches
+
+
+def _ready_batches(entries):
+    """
+    Splits due entries into per-election batches of VOTE_BATCH_SIZE.
+    A short last batch is held back until its oldest vote is
+    VOTE_BATCH_MAX_WAIT_MS old (created_at is cut to the minute, so
+    a short batch may go out earlier than that, never later).
+    """
+    flush_before = (
+        utc_now() - timedelta(milliseconds=Config.VOTE_BATCH_MAX_WAIT_MS)
+    ).isoformat()
+
+    by_election = defaultdict(list)
+    for entry in entries:
+        by_election[entry["election_id"]].append(entry)
+
+    batches = []
+    for election_entries in by_election.values():
+        for i in range(0, len(election_entries), Config.VOTE_BATCH_SIZE):
+            batch = election_entries[i:i + Config.VOTE_BATCH_SIZE]
+
+            full = len(batch) == Config.VOTE_BATCH_SIZE
+            if full or batch[0]["created_at"] <= flush_before:
+                batches.append(batch)
+
+    return batches
+
+
+def _send_batch(entries):
+    batch_id = generate_uuid()
+    attempts = max(e["attempts"] for e in entries) + 1
+
+    # Entries taken by another dispatcher are left out
+    claimed = claim_outbox_entries([e["id"] for e in entries], batch_id, attempts)
+    if not claimed:
+        return 0
+
+    signed = []
+
+    def on_signed(tx_hash):
+        set_batch_tx_hash(batch_id, tx_hash)
+        signed.append(tx_hash)
+
+    try:
+        tx_hash = cast_votes_on_chain(
+            election_id=claimed[0]["election_id"],
+            candidate_ids=[e["candidate_id"] for e in claimed],
+            on_signed=on_signed
+        )
+    except Exception as e:
+        # Once signed, the transaction may have reached the node (e.g. a
+        # timeout on send_raw_transaction). Casting again would count the
+        # batch twice, so it stays SENDING and recover_stale_sends()
+        # looks its hash up on chain before anything is resent.
+        if not signed:
+            requeue_batch(batch_id, str(e), _retry_at(attempts))
+        return 0
+
+    _mark_submitted(batch_id, tx_hash)
+    return len(claimed)
+
+
+def _mark_submitted(batch_id, tx_hash):
+    mark_batch_submitted(batch_id, tx_hash)
+
+    # Picked up by the confirmation tracker (services/tx_confirmation_service)
+    create_ledger_entry(
+        entity_type="VOTE_BATCH",
+        entity_id=batch_id,
+        transaction_hash=tx_hash,
+        status="PENDING"
+    )
+
+
+def dispatch_pending_votes():
+    """
+    Casts due PENDING votes on chain in batches.
+    Returns number of votes submitted.
+    """
+    now = utc_now().isoformat()
+    entries = _due_entries(PENDING, lambda e: e["next_attempt_at"] <= now)
+    batches = _ready_batches(entries)
+
+    if not batches:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=Config.OUTBOX_SEND_WORKERS) as pool:
+        return sum(pool.map(_send_batch, batches))
+
+
+def check_submitted_votes():
+    """
+    Confirms mined batches; reverted or dropped ones go back to PENDING.
+    Returns number of votes confirmed.
+    """
+    stale_before = _seconds_ago(Config.OUTBOX_STALE_SECONDS)
+    confirmed = 0
+
+    batches = _by_batch(_due_entries(SUBMITTED, lambda e: True))
+
+    # One batched receipt lookup for every submitted transaction
+    receipts = get_transaction_receipts(
+        entries[0]["tx_hash"] for entries in batches.values()
+    )
+
+    for batch_id, entries in batches.items():
+        entry = entries[0]
+
+        status, _ = receipts.get(entry["tx_hash"], (None, None))
+        if status is None and entry["updated_at"] < stale_before:
+            status, _ = get_transaction_status(entry["tx_hash"])
+
+        if status == "CONFIRMED":
+            mark_batch_confirmed(batch_id)
+            confirmed += len(entries)
+
+        elif status == "REVERTED":
+            # Reverts are usually deterministic (closed election, bad
+            # candidate): stop resending and leave it to an operator
+            if entry["attempts"] >= Config.OUTBOX_MAX_ATTEMPTS:
+                print(f"⚠️ Vote batch {batch_id} failed: reverted {entry['attempts']} times")
+                mark_batch_failed(batch_id, "Transaction reverted")
+            else:
+                requeue_batch(batch_id, "Transaction reverted", _retry_at(entry["attempts"]))
+
+        elif status == "UNKNOWN":
+            requeue_batch(batch_id, "Transaction dropped", _retry_at(entry["attempts"]))
+
+    return confirmed
+
+
+def recover_stale_sends():
+    """
+    SENDING batches whose dispatcher died mid-send: kept if their
+    signed transaction reached the node, requeued otherwise.
+    """
+    stale_before = _seconds_ago(Config.OUTBOX_STALE_SECONDS)
+    stale = _due_entries(SENDING, lambda e: e["updated_at"] < stale_before)
+    recovered = 0
+
+    for batch_id, entries in _by_batch(stale).items():
+        entry = entries[0]
+
+        status = "UNKNOWN"
+        if entry.get("tx_hash"):
+            status, _ = get_transaction_status(entry["tx_hash"])
+
+        if status == "UNKNOWN":
+            requeue_batch(batch_id, "Dispatcher interrupted", _retry_at(entry["attempts"]))
+        else:
+            _mark_submitted(batch_id, entry["tx_hash"])
+
+        recovered += len(entries)
+
+    return recovered
+
+
+def run_vote_outbox_once():
+    return {
+        "recovered": recover_stale_sends(),
+        "submitted": dispatch_pending_votes(),
+        "confirmed": check_submitted_votes()
+    }
@@ -1,5 +1,5 @@
 from collections import defaultdict
-from services.blockchain_service import get_contract
+from services.blockchain_reader import get_vote_cast_events
 
 
 def tally_votes_from_blockchain(election_id: str) -> dict:
@@ -12,20 +12,13 @@ def tally_votes_from_blockchain(election_id: str) -> dict:
         }
     """
 
-    contract = get_contract()
-
-    # Get all VoteCast events for the election
-    events = contract.events.VoteCast.get_logs(
-        fromBlock=0,
-        argument_filters={
-            "electionId": int(election_id)
-        }
-    )
+    # Get all VoteCast events for the election (chunked block ranges)
+    events = get_vote_cast_events(election_id)
 
     tally = defaultdict(int)
 
     for event in events:
-        candidate_id = event["args"]["candidateId"]
+        candidate_id = event["candidate_id"]
         tally[candidate_id] += 1
 
     return dict(tally)
@@ -5,9 +5,13 @@ from models.vote import (
     mark_voter_as_voted
 )
 
-from models.vote_receipt import store_receipt
+from config import Config
+from services.merkle_service import append_receipt
 from utils.crypto import generate_vote_receipt
 from services.blockchain_service import cast_vote_on_chain
+from services.vote_outbox_service import queue_vote
+from models.ledger import create_ledger_entry
+from utils.helpers import utc_now
 
 
 # -----------------------------
@@ -25,7 +29,8 @@ def submit_vote(
 
     - DB prevents double voting
     - Generates anonymous receipt hash
-    - Records vote on blockchain (event only)
+    - Records vote on blockchain (event only), either inline or
+      through the vote outbox (VOTE_SUBMISSION_MODE)
     - Stores receipt off-chain for Merkle proof
     """
 
@@ -49,17 +54,38 @@ def submit_vote(
     # ------------------------------------------------
     # 3. Cast vote on blockchain (NO receipt stored)
     # ------------------------------------------------
-    tx_hash = cast_vote_on_chain(
-        election_id=election_id,
-        candidate_id=candidate_id,
-        receipt_hash=receipt_hash
-    )
+    if Config.VOTE_SUBMISSION_MODE == "OUTBOX":
+        # Committed locally; jobs/vote_outbox_job casts it on chain
+        queue_vote(election_id=election_id, candidate_id=candidate_id)
+        tx_hash = None
+
+    elif Config.VOTE_SUBMISSION_MODE == "SYNC":
+        tx_hash = cast_vote_on_chain(
+            election_id=election_id,
+            candidate_id=candidate_id,
+            receipt_hash=receipt_hash
+        )
+
+        # Block number is filled in by the confirmation tracker. The
+        # time is cut to the minute, like the vote outbox's, so the row
+        # can't be matched against vote_status.voted_at
+        create_ledger_entry(
+            entity_type="VOTE",
+            entity_id=election_id,
+            transaction_hash=tx_hash,
+            status="PENDING",
+            timestamp=utc_now().replace(second=0, microsecond=0).isoformat()
+        )
+
+    else:
+        raise Exception("Invalid VOTE_SUBMISSION_MODE configuration")
 
     # ------------------------------------------------
-    # 4. Store receipt off-chain (for Merkle proof)
+    # 4. Store receipt off-chain + update Merkle accumulator
     # ------------------------------------------------
-    store_receipt(
+    append_receipt(
         election_id=election_id,
+        constituency_id=constituency_id,
         receipt_hash=receipt_hash
     )
 
@@ -1,7 +1,27 @@
-setInterval(async () => {
-    const res = await fetch("/evote/booth-status");
-    const data = await res.json();
-    if (data.active) {
+// Waits for the presiding officer to authorize a voter.
+// Polls by default; when the server enables BOOTH_STATUS_SSE,
+// Server-Sent Events push the unlock instead (browsers without
+// EventSource still poll).
+
+const useEvents = document.currentScript.dataset.sse === "true";
+
+if (useEvents && window.EventSource) {
+    const events = new EventSource("/evote/booth-events");
+
+    events.addEventListener("unlocked", () => {
+        events.close();
         window.location.href = "/evote/vote";
-    }
-}, 3000);
+    });
+
+    events.addEventListener("locked", () => {
+        events.close();
+    });
+} else {
+    setInterval(async () => {
+        const res = await fetch("/evote/booth-status");
+        const data = await res.json();
+        if (data.active) {
+            window.location.href = "/evote/vote";
+        }
+    }, 3000);
+}
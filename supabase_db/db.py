@@ -1,42 +1,475 @@
+from postgrest.types import CountMethod, ReturnMethod
+from postgrest.utils import sanitize_param
+from flask import g, has_app_context
 from supabase_db.client import supabase_public, supabase_admin
 
 
+# -----------------------------
+# Query Options
+# -----------------------------
+
+# (column, operator, value) conditions accepted next to equality filters
+CONDITION_OPERATORS = ("eq", "neq", "gt", "gte", "lt", "lte", "in", "like", "ilike", "is")
+
+
+def _select(client, table: str, columns: list = None, **kwargs):
+    selected = ",".join(dict.fromkeys(columns)) if columns else "*"
+    return client.table(table).select(selected, **kwargs)
+
+
+def _apply_filters(query, filters: dict = None, conditions: list = None):
+    """
+    filters
+        → {column: value} equality filters
+    conditions
+        → [(column, operator, value)], e.g.
+          ("created_at", "gte", since), ("status", "in", ["Open", "Closed"]),
+          ("title", "ilike", "%road%")
+    """
+    if filters:
+        for key, value in filters.items():
+            query = query.eq(key, value)
+
+    for column, operator, value in conditions or []:
+        if operator not in CONDITION_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+
+        if operator == "in":
+            query = query.in_(column, value)
+        elif operator == "is":
+            query = query.is_(column, value)
+        else:
+            query = getattr(query, operator)(column, value)
+
+    return query
+
+
+def _apply_paging(
+    query,
+    order_by: list = None,
+    limit: int = None,
+    offset: int = None,
+    range: tuple = None
+):
+    """
+    order_by
+        → column names, "-" prefix for descending: ["-created_at", "id"]
+    limit / offset
+        → LIMIT / OFFSET
+    range
+        → (first, last) row positions, both inclusive
+    """
+    if order_by:
+        if isinstance(order_by, str):
+            order_by = [order_by]
+
+        # One order param: repeated order= params are not combined
+        query = query.order(",".join(
+            f"{c[1:]}.desc" if c.startswith("-") else c
+            for c in order_by
+        ))
+
+    if range is not None:
+        offset, limit = range[0], range[1] - range[0] + 1
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    if offset:
+        query = query.offset(offset)
+
+    return query
+
+
 # -----------------------------
 # Read Operations
 # -----------------------------
 
-def fetch_one(table: str, filters: dict, use_admin: bool = False):
+def fetch_one(
+    table: str,
+    filters: dict,
+    use_admin: bool = False,
+    columns: list = None,
+    conditions: list = None,
+    order_by: list = None
+):
     """
     Fetch a single record from a table based on filters.
+    With order_by, the first record in that order.
     """
     client = supabase_admin if use_admin else supabase_public
 
-    query = client.table(table).select("*")
-    for key, value in filters.items():
-        query = query.eq(key, value)
+    query = _select(client, table, columns)
+    query = _apply_filters(query, filters, conditions)
+    query = _apply_paging(query, order_by=order_by, limit=1)
 
-    response = query.limit(1).execute()
+    response = query.execute()
     data = response.data
 
     return data[0] if data else None
 
 
-def fetch_all(table: str, filters: dict = None, use_admin: bool = False):
+def fetch_all(
+    table: str,
+    filters: dict = None,
+    use_admin: bool = False,
+    columns: list = None,
+    conditions: list = None,
+    order_by: list = None,
+    limit: int = None,
+    offset: int = None,
+    range: tuple = None
+):
     """
     Fetch all records from a table with optional filters.
+
+    Filtering, ordering and paging run in Postgres; see
+    _apply_filters() and _apply_paging() for the arguments.
     """
     client = supabase_admin if use_admin else supabase_public
 
-    query = client.table(table).select("*")
-
-    if filters:
-        for key, value in filters.items():
-            query = query.eq(key, value)
+    query = _select(client, table, columns)
+    query = _apply_filters(query, filters, conditions)
+    query = _apply_paging(query, order_by, limit, offset, range)
 
     response = query.execute()
     return response.data
 
 
+def count_records(
+    table: str,
+    filters: dict = None,
+    use_admin: bool = False,
+    conditions: list = None
+) -> int:
+    """
+    Exact number of records matching filters (one row fetched).
+    """
+    client = supabase_admin if use_admin else supabase_public
+
+    query = _select(client, table, count=CountMethod.exact)
+    query = _apply_filters(query, filters, conditions)
+
+    response = query.limit(1).execute()
+    return response.count or 0
+
+
+def count_many(
+    table: str,
+    column: str,
+    ids,
+    filters: dict = None,
+    conditions: list = None,
+    use_admin: bool = False
+) -> dict:
+    """
+    {id: exact number of records whose `column` is id}.
+
+    One IN-filtered select of just (column, id) per URL-sized chunk,
+    counted here: a feed page is one round trip, not one COUNT per
+    id. Each chunk is keyset-paged, so the server's row cap never
+    truncates a count.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    counts = dict.fromkeys(ids, 0)
+
+    for chunk in _in_chunks(ids):
+        for row in iter_all(
+            table,
+            filters,
+            columns=[column],
+            key_columns=[column, "id"],
+            conditions=list(conditions or []) + [(column, "in", chunk)],
+            use_admin=use_admin
+        ):
+            counts[row[column]] += 1
+
+    return counts
+
+
+# Keeps `column=in.(...)` well under common 8 KB URL limits
+IN_FILTER_MAX_CHARS = 4000
+
+
+def _in_chunks(values: list, max_chars: int = IN_FILTER_MAX_CHARS):
+    chunk, size = [], 0
+
+    for value in values:
+        length = len(sanitize_param(value)) + 1
+        if chunk and size + length > max_chars:
+            yield chunk
+            chunk, size = [], 0
+
+        chunk.append(value)
+        size += length
+
+    if chunk:
+        yield chunk
+
+
+def fetch_many(
+    table: str,
+    column: str,
+    ids,
+    filters: dict = None,
+    columns: list = None,
+    group: bool = False,
+    conditions: list = None,
+    use_admin: bool = False
+):
+    """
+    Fetch records whose `column` is one of `ids`.
+
+    IN filters are split into chunks that fit in a request URL.
+    Returns {id: record} → ids with no record are absent.
+
+    group
+        → One-to-many lookups: {id: [records]} instead.
+          A chunk can match more rows than the server's row cap, so
+          each chunk is read in keyset pages over (column, id).
+    """
+    client = supabase_admin if use_admin else supabase_public
+
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+
+    selected = "*"
+    if columns:
+        selected = ",".join(dict.fromkeys(list(columns) + [column]))
+
+    results = {}
+
+    for chunk in _in_chunks(ids):
+        if group:
+            for row in iter_all(
+                table,
+                filters,
+                columns=columns,
+                key_columns=[column, "id"],
+                conditions=list(conditions or []) + [(column, "in", chunk)],
+                use_admin=use_admin
+            ):
+                results.setdefault(row[column], []).append(row)
+            continue
+
+        query = client.table(table).select(selected)
+        query = _apply_filters(query, filters, conditions)
+
+        response = query.in_(column, chunk).execute()
+
+        for row in response.data:
+            results.setdefault(row[column], row)
+
+    return results
+
+
+def _keyset_after(key_columns: list, last_row: dict) -> str:
+    """
+    PostgREST `or` filter selecting rows strictly after last_row
+    in key_columns order, e.g. for (created_at, id):
+    (created_at.gt.X,and(created_at.eq.X,id.gt.Y))
+    """
+    terms = []
+    for i, column in enumerate(key_columns):
+        parts = [
+            f"{c}.eq.{sanitize_param(last_row[c])}"
+            for c in key_columns[:i]
+        ]
+        parts.append(f"{column}.gt.{sanitize_param(last_row[column])}")
+
+        terms.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+
+    return f"({','.join(terms)})"
+
+
+def iter_all(
+    table: str,
+    filters: dict = None,
+    columns: list = None,
+    key_columns: list = ("id",),
+    page_size: int = 1000,
+    use_admin: bool = False,
+    conditions: list = None
+):
+    """
+    Stream records page by page, ordered by key_columns.
+
+    Uses keyset pagination (WHERE key > last key) instead of OFFSET,
+    so every page is an index range scan and no page is ever
+    silently truncated by the server's row cap.
+    key_columns must be unique together.
+    conditions: see _apply_filters()
+    """
+    client = supabase_admin if use_admin else supabase_public
+    key_columns = list(key_columns)
+
+    selected = "*"
+    if columns:
+        selected = ",".join(dict.fromkeys(list(columns) + key_columns))
+
+    last_row = None
+
+    while True:
+        query = client.table(table).select(selected)
+        query = _apply_filters(query, filters, conditions)
+
+        if last_row:
+            # postgrest-py has no or_() helper in this version
+            query.params = query.params.add("or", _keyset_after(key_columns, last_row))
+
+        # One order param: repeated order= params are not combined
+        query = query.order(",".join(key_columns))
+
+        rows = query.limit(page_size).execute().data
+
+        yield from rows
+
+        if len(rows) < page_size:
+            return
+
+        last_row = rows[-1]
+
+
+# -----------------------------
+# Request-scoped Loader Cache
+# -----------------------------
+# One page render looks up the same rows (users, aliases, voters,
+# the issue itself) many times. Inside a Flask request those lookups
+# go through an identity map on `g`:
+# - identical (table, filters) lookups hit Postgres once per request
+#   (missing rows are remembered too)
+# - load_many() fetches every not-yet-loaded id with one IN query,
+#   so a loop can prime the cache before its per-row lookups
+# - queue_load() only notes ids; the first lookup that misses on the
+#   same (table, column) fetches all of them, itself included, with
+#   one IN query, so helpers that each queue ids share one round trip
+# - any write through this module forgets the table's cached rows
+# Outside a request (jobs, scripts) every call goes to Postgres.
+
+def _loader_cache():
+    if not has_app_context():
+        return None
+
+    if "_row_loader" not in g:
+        g._row_loader = {}
+
+    return g._row_loader
+
+
+def _loader_queue():
+    """
+    (table, column, use_admin) -> ids queued but not fetched yet.
+    """
+    if "_row_loader_queue" not in g:
+        g._row_loader_queue = {}
+
+    return g._row_loader_queue
+
+
+def _fetch_into_cache(cache, table: str, column: str, ids: list, use_admin: bool):
+    """
+    Fetches `ids` together with every id queued for (table, column)
+    in one fetch_many() call and caches them (misses as None).
+    """
+    queued = _loader_queue().pop((table, column, use_admin), ())
+
+    ids = [
+        i for i in dict.fromkeys(list(ids) + list(queued))
+        if _loader_key(table, {column: i}, use_admin) not in cache
+    ]
+    if not ids:
+        return
+
+    rows = fetch_many(table, column, ids, use_admin=use_admin)
+    for i in ids:
+        cache[_loader_key(table, {column: i}, use_admin)] = rows.get(i)
+
+
+def _loader_key(table: str, filters: dict, use_admin: bool):
+    return table, use_admin, tuple(sorted(filters.items()))
+
+
+def load_one(table: str, filters: dict, use_admin: bool = False):
+    """
+    fetch_one() through the request's loader cache.
+
+    Returns a copy of the cached row, so callers may decorate it.
+    """
+    cache = _loader_cache()
+
+    try:
+        key = _loader_key(table, filters, use_admin)
+        hash(key)
+    except TypeError:
+        cache = None
+
+    if cache is None:
+        return fetch_one(table, filters, use_admin=use_admin)
+
+    if key not in cache:
+        column = next(iter(filters)) if len(filters) == 1 else None
+
+        # Batched with the ids queued for the same column, if any
+        if column and (table, column, use_admin) in _loader_queue():
+            _fetch_into_cache(cache, table, column, [filters[column]], use_admin)
+        else:
+            cache[key] = fetch_one(table, filters, use_admin=use_admin)
+
+    row = cache[key]
+    return dict(row) if row is not None else None
+
+
+def load_many(table: str, column: str, ids, use_admin: bool = False):
+    """
+    Batched load_one(table, {column: id}) for many ids.
+
+    Ids not cached yet are fetched with one fetch_many() call.
+    Returns {id: row or None}.
+    """
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    cache = _loader_cache()
+
+    if cache is None:
+        rows = fetch_many(table, column, ids, use_admin=use_admin)
+        return {i: rows.get(i) for i in ids}
+
+    _fetch_into_cache(cache, table, column, ids, use_admin)
+
+    results = {}
+    for i in ids:
+        row = cache[_loader_key(table, {column: i}, use_admin)]
+        results[i] = dict(row) if row is not None else None
+
+    return results
+
+
+def queue_load(table: str, column: str, ids, use_admin: bool = False):
+    """
+    Notes ids for a later load_one(table, {column: id}) or load_many()
+    without fetching anything yet; the first of those that misses
+    fetches every queued id in the same IN query.
+    Outside a request this does nothing.
+    """
+    if _loader_cache() is None:
+        return
+
+    queued = _loader_queue().setdefault((table, column, use_admin), {})
+    for i in ids:
+        if i is not None:
+            queued[i] = None
+
+
+def invalidate_loaded(table: str):
+    """
+    Forget the request's cached rows of a table (after a write).
+    """
+    cache = _loader_cache()
+    if not cache:
+        return
+
+    for key in [k for k in cache if k[0] == table]:
+        del cache[key]
+
+
 # -----------------------------
 # Write Operations
 # -----------------------------
@@ -46,16 +479,80 @@ def insert_record(table: str, payload: dict, use_admin: bool = False):
     Insert a new record into a table.
     """
     client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
 
     response = client.table(table).insert(payload).execute()
     return response.data
 
 
+def insert_records(
+    table: str,
+    payloads: list,
+    use_admin: bool = False,
+    ignore_conflicts_on: list = None
+):
+    """
+    Insert many records in a single request (multi-row INSERT).
+
+    ignore_conflicts_on
+        → Rows clashing on these unique columns are skipped,
+          which makes re-sending the same chunk safe.
+    """
+    if not payloads:
+        return []
+
+    client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
+    query = client.table(table)
+
+    if ignore_conflicts_on:
+        query = query.upsert(
+            payloads,
+            on_conflict=",".join(ignore_conflicts_on),
+            ignore_duplicates=True,
+            returning=ReturnMethod.minimal
+        )
+    else:
+        query = query.insert(payloads, returning=ReturnMethod.minimal)
+
+    response = query.execute()
+    return response.data
+
+
+def insert_record_if_absent(
+    table: str,
+    payload: dict,
+    conflict_columns: list,
+    use_admin: bool = False
+):
+    """
+    Insert a record unless one already exists for conflict_columns
+    (INSERT ... ON CONFLICT DO NOTHING).
+
+    Returns the inserted rows → empty if the record already existed.
+    """
+    client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
+
+    response = (
+        client
+        .table(table)
+        .upsert(
+            payload,
+            on_conflict=",".join(conflict_columns),
+            ignore_duplicates=True
+        )
+        .execute()
+    )
+    return response.data
+
+
 def update_record(table: str, filters: dict, payload: dict, use_admin: bool = False):
     """
     Update record(s) in a table based on filters.
     """
     client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
 
     query = client.table(table).update(payload)
     for key, value in filters.items():
@@ -65,11 +562,44 @@ def update_record(table: str, filters: dict, payload: dict, use_admin: bool = Fa
     return response.data
 
 
+def update_many(
+    table: str,
+    column: str,
+    ids,
+    payload: dict,
+    filters: dict = None,
+    use_admin: bool = False
+):
+    """
+    Apply the same update to every record whose `column` is one of
+    `ids`, with one chunked IN-filtered UPDATE per URL-sized chunk.
+
+    Returns the updated rows.
+    """
+    client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
+
+    ids = list(dict.fromkeys(i for i in ids if i is not None))
+    updated = []
+
+    for chunk in _in_chunks(ids):
+        query = client.table(table).update(payload)
+
+        if filters:
+            for key, value in filters.items():
+                query = query.eq(key, value)
+
+        updated.extend(query.in_(column, chunk).execute().data)
+
+    return updated
+
+
 def delete_record(table: str, filters: dict, use_admin: bool = False):
     """
     Delete record(s) from a table based on filters.
     """
     client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
 
     query = client.table(table).delete()
     for key, value in filters.items():
@@ -84,7 +614,8 @@ def upsert_record(
     conflict_columns: list,
     use_admin: bool = False
 ):
-    client = supabase_admin if use_admin else supabase
+    client = supabase_admin if use_admin else supabase_public
+    invalidate_loaded(table)
 
     return (
         client
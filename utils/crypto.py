@@ -36,4 +36,46 @@ def uuid_to_uint256(uuid_str: str) -> int:
     suitable for blockchain.
     """
     hash_bytes = hashlib.sha256(uuid_str.encode()).digest()
-    return int.from_bytes(hash_bytes, byteorder="big")
\ No newline at end of file
+    return int.from_bytes(hash_bytes, byteorder="big")
+
+# -------------------------------------------------
+# CANDIDATE ID CODEC
+# -------------------------------------------------
+# Candidates are identified on chain by uuid_to_uint256(candidate_id).
+# Both directions are memoized per process. The reverse direction only
+# knows candidates that were registered, either at nomination or when
+# loaded from the persisted candidates.chain_id column.
+
+CANDIDATE_UINT_BY_ID = {}   # candidate_id -> uint256
+CANDIDATE_ID_BY_UINT = {}   # uint256 -> candidate_id
+
+
+def register_candidate_id(candidate_id: str, candidate_uint=None) -> int:
+    """
+    Adds a candidate to the codec and returns its uint256 id.
+    candidate_uint: persisted chain id, saves rehashing.
+    """
+    candidate_uint = (
+        int(candidate_uint) if candidate_uint is not None
+        else uuid_to_uint256(candidate_id)
+    )
+
+    CANDIDATE_UINT_BY_ID[candidate_id] = candidate_uint
+    CANDIDATE_ID_BY_UINT[candidate_uint] = candidate_id
+
+    return candidate_uint
+
+
+def candidate_id_to_uint(candidate_id: str) -> int:
+    candidate_uint = CANDIDATE_UINT_BY_ID.get(candidate_id)
+    if candidate_uint is None:
+        candidate_uint = register_candidate_id(candidate_id)
+    return candidate_uint
+
+
+def candidate_uint_to_id(candidate_uint):
+    """
+    Candidate UUID for an on-chain id (int or decimal string),
+    or None if that candidate has not been registered.
+    """
+    return CANDIDATE_ID_BY_UINT.get(int(candidate_uint))
@@ -1,8 +1,15 @@
 # utils/merkle.py
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from eth_hash.auto import keccak
 from typing import List
 
+# Levels smaller than this are hashed inline even in parallel mode;
+# shipping them to worker processes costs more than hashing them.
+PARALLEL_MIN_LEVEL = 1 << 14
+PARALLEL_CHUNK_SIZE = 1 << 16
+
 
 def _hash(data: bytes) -> bytes:
     return keccak(data)
@@ -13,23 +20,73 @@ def hash_leaf(value: str) -> bytes:
     return bytes.fromhex(value)
 
 
+def _hash_level(level: List[bytes]) -> List[bytes]:
+    next_level = []
+    for i in range(0, len(level), 2):
+        left = level[i]
+        right = level[i + 1] if i + 1 < len(level) else left
 
-def build_merkle_tree(receipt_hashes):
-    level = [bytes.fromhex(r) for r in receipt_hashes]
-    tree = [level]
+        # ✅ SORT before hashing
+        combined = left + right if left < right else right + left
+        next_level.append(_hash(combined))
+
+    return next_level
+
+
+def _hash_level_chunk(packed: bytes) -> bytes:
+    """
+    Process-pool worker: hashes a run of packed 32-byte nodes pairwise.
+    Runs start on an even node index, so pairs never span two chunks.
+    """
+    nodes = [packed[i:i + 32] for i in range(0, len(packed), 32)]
+    return b"".join(_hash_level(nodes))
+
+
+def _hash_level_parallel(level: List[bytes], pool, chunk_size: int) -> List[bytes]:
+    chunks = [
+        b"".join(level[i:i + chunk_size])
+        for i in range(0, len(level), chunk_size)
+    ]
+
+    next_level = []
+    # map() yields in submission order → levels merge back in order
+    for packed in pool.map(_hash_level_chunk, chunks):
+        next_level.extend(packed[i:i + 32] for i in range(0, len(packed), 32))
 
-    while len(level) > 1:
-        next_level = []
-        for i in range(0, len(level), 2):
-            left = level[i]
-            right = level[i + 1] if i + 1 < len(level) else left
+    return next_level
+
+
+def build_merkle_tree(receipt_hashes, workers: int = 1, chunk_size: int = PARALLEL_CHUNK_SIZE):
+    """
+    Builds every level of the tree, leaves first.
 
-            # ✅ SORT before hashing
-            combined = left + right if left < right else right + left
-            next_level.append(_hash(combined))
+    workers > 1 hashes large levels in a process pool of that size;
+    the result is identical to the serial build.
+    """
+    level = [bytes.fromhex(r) for r in receipt_hashes]
+    tree = [level]
 
-        level = next_level
-        tree.append(level)
+    if workers <= 1 or len(level) < PARALLEL_MIN_LEVEL:
+        while len(level) > 1:
+            level = _hash_level(level)
+            tree.append(level)
+        return tree
+
+    chunk_size += chunk_size % 2
+
+    # spawn, not fork: builds run inside threaded gunicorn workers and
+    # the shard thread pool, and forking a threaded process can hand
+    # the children locks held by other threads.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        while len(level) > 1:
+            if len(level) < PARALLEL_MIN_LEVEL:
+                level = _hash_level(level)
+            else:
+                level = _hash_level_parallel(level, pool, chunk_size)
+            tree.append(level)
 
     return tree
 
@@ -55,17 +112,141 @@ def get_merkle_proof(receipt_hashes: List[str], target_receipt: str) -> List[str
     if target_receipt not in receipt_hashes:
         raise ValueError("Receipt not found")
 
-    tree = build_merkle_tree(receipt_hashes)
-    index = receipt_hashes.index(target_receipt)
+    return MerkleTree(receipt_hashes).get_proof(target_receipt)
+
+
+# -----------------------------
+# Build-once proof engine
+# -----------------------------
+
+class MerkleTree:
+    """
+    Builds the tree ONCE and keeps every level in memory so that
+    proofs can be served in O(log n) each.
+
+    Proofs are identical to get_merkle_proof(): for duplicated
+    receipts the first occurrence wins, and a node promoted on an
+    odd level contributes no sibling.
+    """
+
+    def __init__(self, receipt_hashes: List[str], workers: int = 1):
+        if not receipt_hashes:
+            raise ValueError("Cannot build Merkle tree without receipts")
+
+        self.receipt_hashes = receipt_hashes
+        self.levels = build_merkle_tree(receipt_hashes, workers=workers)
+
+        # receipt_hash -> leaf index (first occurrence, like list.index)
+        self.index = {}
+        for i, r in enumerate(receipt_hashes):
+            self.index.setdefault(r, i)
+
+    @property
+    def root(self) -> str:
+        return self.levels[-1][0].hex()
 
-    proof = []
+    def get_proof_by_index(self, index: int) -> List[str]:
+        proof = []
 
-    for level in tree[:-1]:
-        sibling_index = index ^ 1  # flip last bit
+        for level in self.levels[:-1]:
+            sibling_index = index ^ 1
 
-        if sibling_index < len(level):
-            proof.append(level[sibling_index].hex())
+            if sibling_index < len(level):
+                proof.append(level[sibling_index].hex())
 
-        index //= 2
+            index //= 2
 
-    return proof
+        return proof
+
+    def get_proof(self, receipt_hash: str) -> List[str]:
+        index = self.index.get(receipt_hash)
+        if index is None:
+            raise ValueError("Receipt not found")
+
+        return self.get_proof_by_index(index)
+
+    def iter_proofs(self):
+        """
+        Yields (receipt_hash, proof) for every receipt, in receipt order.
+        Single O(n log n) pass over the stored levels.
+        """
+        for r in self.receipt_hashes:
+            yield r, self.get_proof_by_index(self.index[r])
+
+
+# -----------------------------
+# Append-only accumulator
+# -----------------------------
+
+def _hash_pair(a: bytes, b: bytes) -> bytes:
+    return _hash(a + b if a < b else b + a)
+
+
+def accumulator_append(frontier: list, leaf_count: int, leaf: bytes) -> list:
+    """
+    Appends one leaf to a Merkle frontier in O(log n).
+
+    frontier[h] is the root of the complete 2^h-leaf subtree that
+    is still waiting for a right sibling (set while bit h of
+    leaf_count is 1), otherwise None.
+
+    Returns the frontier for leaf_count + 1 leaves.
+    """
+    frontier = list(frontier)
+    node = leaf
+    h = 0
+
+    while (leaf_count >> h) & 1:
+        node = _hash_pair(frontier[h], node)
+        frontier[h] = None
+        h += 1
+
+    if h == len(frontier):
+        frontier.append(node)
+    else:
+        frontier[h] = node
+
+    return frontier
+
+
+def accumulator_root(frontier: list, leaf_count: int) -> bytes:
+    """
+    Root of the frontier, identical to get_merkle_root() over the
+    same ordered leaves (a trailing odd node is paired with itself).
+    """
+    if leaf_count < 1:
+        raise ValueError("Cannot compute Merkle root without receipts")
+
+    height = (leaf_count - 1).bit_length()
+    partial = None  # last, incomplete node of the current level
+
+    for h in range(height):
+        if (leaf_count >> h) & 1:
+            partial = _hash_pair(
+                frontier[h],
+                partial if partial is not None else frontier[h]
+            )
+        elif partial is not None:
+            partial = _hash_pair(partial, partial)
+
+    return partial if partial is not None else frontier[height]
+
+
+# -----------------------------
+# Proof verification
+# -----------------------------
+
+def verify_merkle_proof(receipt_hash: str, proof: List[str], root: str) -> bool:
+    """
+    Off-chain equivalent of the contract's verifyReceipt
+    (OpenZeppelin MerkleProof.verify: sorted-pair keccak).
+    """
+    try:
+        node = bytes.fromhex(receipt_hash)
+        for sibling in proof:
+            node = _hash_pair(node, bytes.fromhex(sibling))
+        expected = bytes.fromhex(root[2:] if root.startswith("0x") else root)
+    except ValueError:
+        return False
+
+    return node == expected
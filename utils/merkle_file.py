@@ -0,0 +1,234 @@
+# utils/merkle_file.py
+
+import heapq
+import mmap
+import os
+import struct
+import uuid
+from typing import List, Optional
+
+# -----------------------------
+# File Layout (big-endian)
+# -----------------------------
+# header   : magic(4) version(u16) level_count(u16) leaf_count(u64)
+# counts   : level_count x u64 node count, leaves first
+# levels   : every level as a flat array of 32-byte nodes
+# index    : leaf_count x (receipt bytes32, leaf index u64),
+#            sorted by receipt then leaf index
+
+MAGIC = b"EDMT"
+VERSION = 1
+NODE_SIZE = 32
+
+_HEADER = struct.Struct(">4sHHQ")
+_COUNT = struct.Struct(">Q")
+_INDEX_ENTRY = struct.Struct(">32sQ")
+
+# Receipt → shard index of a sharded election (one file per election)
+# header   : magic(4) version(u16) entry_count(u64)
+# entries  : entry_count x (receipt bytes32, shard no u32),
+#            sorted by receipt then shard no
+SHARD_INDEX_MAGIC = b"EDSI"
+_SHARD_INDEX_HEADER = struct.Struct(">4sHQ")
+_SHARD_ENTRY = struct.Struct(">32sI")
+
+
+def write_merkle_tree_file(levels: List[List[bytes]], path: str):
+    """
+    Writes tree levels (as returned by build_merkle_tree) to `path`.
+    The file is written next to its target and renamed into place,
+    so readers never see a partial tree (concurrent writers each use
+    their own temporary file).
+    """
+    leaves = levels[0]
+
+    for level in levels:
+        for node in level:
+            if len(node) != NODE_SIZE:
+                raise ValueError("Merkle nodes must be 32 bytes")
+
+    order = sorted(range(len(leaves)), key=leaves.__getitem__)
+
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(levels), len(leaves)))
+
+        for level in levels:
+            f.write(_COUNT.pack(len(level)))
+
+        for level in levels:
+            f.write(b"".join(level))
+
+        for i in order:
+            f.write(_INDEX_ENTRY.pack(leaves[i], i))
+
+    os.replace(tmp_path, path)
+
+
+class MerkleTreeFile:
+    """
+    Read-only, memory-mapped view of a tree written by
+    write_merkle_tree_file(). Proofs are derived in O(log n)
+    and match utils.merkle.get_merkle_proof().
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, level_count, leaf_count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Unsupported Merkle tree file")
+
+        self.leaf_count = leaf_count
+
+        offset = _HEADER.size
+        self.level_sizes = []
+        for _ in range(level_count):
+            self.level_sizes.append(_COUNT.unpack_from(self._mm, offset)[0])
+            offset += _COUNT.size
+
+        self.level_offsets = []
+        for size in self.level_sizes:
+            self.level_offsets.append(offset)
+            offset += size * NODE_SIZE
+
+        self.index_offset = offset
+
+    def _node(self, level: int, i: int) -> bytes:
+        start = self.level_offsets[level] + i * NODE_SIZE
+        return self._mm[start:start + NODE_SIZE]
+
+    @property
+    def root(self) -> str:
+        return self._node(len(self.level_sizes) - 1, 0).hex()
+
+    def find_leaf_index(self, receipt_hash: str) -> Optional[int]:
+        """
+        Binary search over the sorted receipt index.
+        Returns the first leaf holding this receipt, or None.
+        """
+        try:
+            target = bytes.fromhex(receipt_hash)
+        except ValueError:
+            return None
+
+        lo, hi = 0, self.leaf_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self.index_offset + mid * _INDEX_ENTRY.size
+            if self._mm[start:start + NODE_SIZE] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo == self.leaf_count:
+            return None
+
+        leaf, index = _INDEX_ENTRY.unpack_from(
+            self._mm, self.index_offset + lo * _INDEX_ENTRY.size
+        )
+        return index if leaf == target else None
+
+    def get_proof_by_index(self, index: int) -> List[str]:
+        proof = []
+
+        for level, size in enumerate(self.level_sizes[:-1]):
+            sibling_index = index ^ 1
+
+            if sibling_index < size:
+                proof.append(self._node(level, sibling_index).hex())
+
+            index //= 2
+
+        return proof
+
+    def iter_sorted_receipts(self):
+        """
+        Yields every leaf (bytes32) in sorted order, from the index.
+        """
+        for i in range(self.leaf_count):
+            start = self.index_offset + i * _INDEX_ENTRY.size
+            yield self._mm[start:start + NODE_SIZE]
+
+    def get_proof(self, receipt_hash: str) -> Optional[List[str]]:
+        index = self.find_leaf_index(receipt_hash)
+        if index is None:
+            return None
+
+        return self.get_proof_by_index(index)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+
+def write_shard_index_file(shard_files: List[MerkleTreeFile], path: str):
+    """
+    Merges the sorted receipt indexes of an election's shard files
+    into one receipt → shard number index (streamed, O(1) memory).
+    """
+    def tagged(shard_no, shard):
+        for leaf in shard.iter_sorted_receipts():
+            yield leaf, shard_no
+
+    entries = heapq.merge(*(
+        tagged(shard_no, shard)
+        for shard_no, shard in enumerate(shard_files)
+    ))
+
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        count = sum(shard.leaf_count for shard in shard_files)
+        f.write(_SHARD_INDEX_HEADER.pack(SHARD_INDEX_MAGIC, VERSION, count))
+
+        for leaf, shard_no in entries:
+            f.write(_SHARD_ENTRY.pack(leaf, shard_no))
+
+    os.replace(tmp_path, path)
+
+
+class ShardIndexFile:
+    """
+    Memory-mapped view of a file written by write_shard_index_file().
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.entry_count = _SHARD_INDEX_HEADER.unpack_from(self._mm, 0)
+        if magic != SHARD_INDEX_MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("Unsupported shard index file")
+
+    def find_shard(self, receipt_hash: str) -> Optional[int]:
+        """
+        Binary search: the first shard holding this receipt, or None.
+        """
+        try:
+            target = bytes.fromhex(receipt_hash)
+        except ValueError:
+            return None
+
+        lo, hi = 0, self.entry_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = _SHARD_INDEX_HEADER.size + mid * _SHARD_ENTRY.size
+            if self._mm[start:start + NODE_SIZE] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo == self.entry_count:
+            return None
+
+        leaf, shard_no = _SHARD_ENTRY.unpack_from(
+            self._mm, _SHARD_INDEX_HEADER.size + lo * _SHARD_ENTRY.size
+        )
+        return shard_no if leaf == target else None
+
+    def close(self):
+        self._mm.close()
+        self._file.close()